@@ -102,26 +102,29 @@ with col2:
 st.markdown("<br><br>", unsafe_allow_html=True)
 
 # Backend status check
-from services.api_client import api_client
+from services.api_client import api_client, latency_budget
+from utils.constants import PAGE_LATENCY_BUDGET
 
 st.markdown("<h3 style='text-align: center;'>System Status</h3>", unsafe_allow_html=True)
 
 col1, col2, col3, col4 = st.columns([1, 2, 2, 1])
 
-with col2:
-    try:
-        health = api_client.health_check()
-        st.success("Backend Connected")
-    except Exception as e:
-        st.error("Backend Disconnected")
+# Both status checks share one deadline so a slow backend can't stall the page
+with latency_budget(PAGE_LATENCY_BUDGET):
+    with col2:
+        try:
+            health = api_client.health_check()
+            st.success("Backend Connected")
+        except Exception as e:
+            st.error("Backend Disconnected")
 
-with col3:
-    try:
-        devices = api_client.get_devices()
-        status_text = f"Device(s) Connected: {len(devices)}" if devices else "No Devices Found"
-        st.info(status_text)
-    except:
-        st.warning("Device check unavailable")
+    with col3:
+        try:
+            devices = api_client.get_devices()
+            status_text = f"Device(s) Connected: {len(devices)}" if devices else "No Devices Found"
+            st.info(status_text)
+        except:
+            st.warning("Device check unavailable")
 
 st.markdown("<br><br><br>", unsafe_allow_html=True)
 st.markdown("""
@@ -0,0 +1,243 @@
+"""
+Page Benchmark Runner
+Drives app.py and the dashboard pages headlessly (streamlit AppTest) against
+the stub backend and reports render time, requests and bytes per rerun
+
+Each page runs in its own process with fresh local caches, so its first run
+is cold. Requests and bytes are counted over a fixed wall-clock window per
+rerun, which includes the shared pollers' background traffic.
+
+Usage:
+    python -m benchmarks.run --reruns 10 --output bench.json
+    python -m benchmarks.run --latency-ms 50 --baseline bench.json
+    python -m benchmarks.run --latency-ms 50 --devices 200 --clients  # sync vs async fan-out
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional, Dict, List, Any
+
+from benchmarks.stub_backend import StubBackend, StubConfig
+from utils.constants import DEFAULT_REFRESH_INTERVAL
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ("app.py", "pages/1_Dashboard.py", "pages/2_Blockchain.py")
+COMPARED_METRICS = ("median_ms", "requests", "bytes")  # checked against --baseline
+STUB_OPTIONS = ("latency_ms", "jitter_ms", "error_rate", "devices", "history_size", "log_count",
+                "stream_interval_ms", "seed")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=REPO_ROOT).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def bench_page(path: str, backend: StubBackend, reruns: int, timeout: float, window: float) -> Dict[str, Any]:
+    """
+    Cold first run plus `reruns` warm reruns of one page script
+    Backend traffic is counted over `window` seconds from the start of each
+    run, so requests made by background pollers between reruns are included
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, path), default_timeout=timeout)
+    runs = []
+    for _ in range(reruns + 1):
+        backend.reset_stats()
+        started = time.perf_counter()
+        app.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        time.sleep(max(window - elapsed / 1000, 0))
+        stats = backend.stats()
+        runs.append({
+            "ms": elapsed,
+            "requests": sum(s["requests"] for s in stats.values()),
+            "bytes": sum(s["bytes"] for s in stats.values()),
+            "routes": {route: s["requests"] for route, s in sorted(stats.items())},
+            "exceptions": [e.value for e in app.exception],
+        })
+
+    cold, warm = runs[0], runs[1:] or runs[:1]
+    return {
+        "cold_ms": round(cold["ms"], 1),
+        "cold_requests": cold["requests"],
+        "cold_bytes": cold["bytes"],
+        "median_ms": round(statistics.median(r["ms"] for r in warm), 1),
+        "p95_ms": round(_percentile([r["ms"] for r in warm], 0.95), 1),
+        "requests": round(statistics.mean(r["requests"] for r in warm), 1),
+        "bytes": round(statistics.mean(r["bytes"] for r in warm)),
+        "routes": warm[-1]["routes"],
+        "exceptions": sorted({e for r in runs for e in r["exceptions"]}),
+    }
+
+
+def bench_clients(config: StubConfig, reruns: int) -> Dict[str, Any]:
+    """
+    Latest reading of every stub device, one request per device (batch routes
+    off): the sync client's thread fan-out vs AsyncVayuAPIClient.gather_devices
+    """
+    from services.api_client import VayuAPIClient
+    from services.async_api_client import AsyncVayuAPIClient, run_async
+
+    backend = StubBackend(StubConfig(**dict(config.as_dict(), batch_endpoints=False))).start()
+    sync_client = VayuAPIClient(base_url=backend.url)
+    async_client = AsyncVayuAPIClient(base_url=backend.url)
+    fetches = {
+        "sync_threads": lambda: sync_client.get_many_sensor_history(backend.devices, limit=1),
+        "async_gather": lambda: run_async(async_client.gather_devices(backend.devices, "get_sensor_history", limit=1)),
+    }
+    results = {}
+    try:
+        for name, fetch in fetches.items():
+            timings, errors = [], 0
+            for _ in range(reruns + 1):
+                started = time.perf_counter()
+                answers = fetch()
+                timings.append((time.perf_counter() - started) * 1000)
+                errors += sum(isinstance(answer, Exception) for answer in answers.values())
+            results[name] = {"median_ms": round(statistics.median(timings[1:] or timings), 1), "errors": errors}
+        run_async(async_client.close())
+    finally:
+        backend.stop()
+    return results
+
+
+def bench_isolated(page: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark one page in a fresh interpreter (the services are process-wide singletons)"""
+    with tempfile.TemporaryDirectory(prefix="vayu-bench-") as workdir:
+        output = os.path.join(workdir, "page.json")
+        command = [sys.executable, "-m", "benchmarks.run", "--in-process", "--pages", page, "--output", output,
+                   "--reruns", str(args.reruns), "--timeout", str(args.timeout), "--window", str(args.window)]
+        for option in STUB_OPTIONS:
+            command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+        if args.dashboard_endpoint:
+            command.append("--dashboard-endpoint")
+        if args.no_batch:
+            command.append("--no-batch")
+        subprocess.run(command, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+        with open(output) as f:
+            return json.load(f)["pages"][page]
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics more than `tolerance` (fraction) worse than the baseline run"""
+    regressions = []
+    for page, metrics in results["pages"].items():
+        before = baseline.get("pages", {}).get(page)
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > 0.5:
+                regressions.append(f"{page} {metric}: {old} -> {new} ({(new / old - 1) * 100 if old else float('inf'):+.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pages against a stub backend")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), help="page scripts to run")
+    parser.add_argument("--reruns", type=int, default=5, help="warm reruns per page after the cold run")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds allowed per page run")
+    parser.add_argument("--window", type=float, default=DEFAULT_REFRESH_INTERVAL,
+                        help="seconds of backend traffic counted per run (incl. background polling)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random stub delay per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub responses that are 503")
+    parser.add_argument("--devices", type=int, default=3, help="devices registered on the stub")
+    parser.add_argument("--history-size", type=int, default=1000, help="readings available per device")
+    parser.add_argument("--log-count", type=int, default=500, help="blockchain log entries on the stub")
+    parser.add_argument("--dashboard-endpoint", action="store_true", help="implement /api/v1/dashboard/data")
+    parser.add_argument("--no-batch", action="store_true", help="answer the batch routes with 404")
+    parser.add_argument("--stream-interval-ms", type=float, default=0.0,
+                        help="serve the live event stream, one reading per device this often (0 = no stream)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression vs the baseline (fraction)")
+    parser.add_argument("--clients", action="store_true",
+                        help="also time a multi-device fetch with the sync and the async client")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run all pages in this process (later pages start warm)")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        devices=args.devices, history_size=args.history_size, log_count=args.log_count,
+        dashboard_endpoint=args.dashboard_endpoint, batch_endpoints=not args.no_batch,
+        stream_interval_ms=args.stream_interval_ms, seed=args.seed
+    )
+    results = {"commit": _git_commit(), "config": config.as_dict(), "reruns": args.reruns,
+               "window": args.window, "pages": {}}
+
+    if not args.in_process:
+        for page in args.pages:
+            results["pages"][page] = bench_isolated(page, args)
+        if args.clients:
+            results["clients"] = bench_clients(config, args.reruns)
+        return report(results, config, args)
+
+    backend = StubBackend(config).start()
+    workdir = tempfile.mkdtemp(prefix="vayu-bench-")
+
+    # The services read these at import time, so set them before any page runs;
+    # fresh local caches keep runs comparable
+    os.environ.update({
+        "BACKEND_URL": backend.url,
+        "LIVE_STREAM": "true" if args.stream_interval_ms else "false",
+        "LOG_CACHE_PATH": os.path.join(workdir, "blockchain_logs.sqlite3"),
+        "TIMESERIES_PATH": os.path.join(workdir, "timeseries"),
+    })
+
+    try:
+        for page in args.pages:
+            results["pages"][page] = bench_page(page, backend, args.reruns, args.timeout, args.window)
+    finally:
+        backend.stop()
+    if args.clients:
+        results["clients"] = bench_clients(config, args.reruns)
+    return report(results, config, args)
+
+
+def report(results: Dict[str, Any], config: StubConfig, args: argparse.Namespace) -> int:
+    """Print the results table, write --output and check against --baseline"""
+    print(f"commit {results['commit']}  latency {config.latency_ms}ms  errors {config.error_rate:.0%}  devices {config.devices}")
+    print(f"{'page':<24}{'cold ms':>10}{'median ms':>11}{'p95 ms':>9}{'requests':>10}{'bytes':>10}")
+    for page, m in results["pages"].items():
+        print(f"{page:<24}{m['cold_ms']:>10}{m['median_ms']:>11}{m['p95_ms']:>9}{m['requests']:>10}{m['bytes']:>10}")
+        for error in m["exceptions"]:
+            print(f"  exception: {error}")
+    for name, m in results.get("clients", {}).items():
+        print(f"client {name:<17}{m['median_ms']:>21} ms median ({config.devices} devices, {m['errors']} errors)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\nvs baseline {baseline.get('commit')}: " + ("no regressions" if not regressions else "REGRESSIONS"))
+        for line in regressions:
+            print(f"  {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Stub VAYU AI Backend for Benchmarks
+Local HTTP server implementing every route VayuAPIClient uses, with
+configurable latency, payload size and error rate, and per-route counters
+"""
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, List, Any
+from urllib.parse import urlparse, parse_qs
+
+from utils.constants import API_ROUTES, STREAM_ENDPOINT, CHAIN_HASH_FIELDS
+
+
+class StubConfig:
+    """
+    Stub behaviour
+
+    latency_ms / jitter_ms: delay added to every response
+    error_rate: probability of answering 503 (0..1)
+    devices: registered device count
+    history_size: readings available per device (responses honour `limit`)
+    log_count: blockchain log entries in the chain
+    dashboard_endpoint / batch_endpoints: whether those optional routes exist
+    stream_interval_ms: period of the live event stream's sensor_reading
+        rounds (one event per device); 0 answers the stream route with 404
+    seed: random seed, so runs are reproducible
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 devices: int = 3, history_size: int = 1000, log_count: int = 500,
+                 dashboard_endpoint: bool = False, batch_endpoints: bool = True,
+                 stream_interval_ms: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.devices = devices
+        self.history_size = history_size
+        self.log_count = log_count
+        self.dashboard_endpoint = dashboard_endpoint
+        self.batch_endpoints = batch_endpoints
+        self.stream_interval_ms = stream_interval_ms
+        self.seed = seed
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+def _build_chain(count: int, start: datetime) -> List[Dict]:
+    """Hash-linked blockchain log, oldest first (same hashing as the chain verifier)"""
+    logs, previous = [], "0" * 64
+    for i in range(count):
+        log = {
+            "event_type": ("decision", "fault", "healing")[i % 3],
+            "timestamp": _iso(start + timedelta(seconds=i * 30)),
+            "device_id": f"ESP32_{i % 3 + 1:03d}",
+            "data": {"sequence": i, "reason": "benchmark"},
+            "previous_hash": previous,
+        }
+        canonical = json.dumps({f: log.get(f) for f in CHAIN_HASH_FIELDS}, sort_keys=True, separators=(",", ":"))
+        log["hash"] = previous = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        logs.append(log)
+    return logs
+
+
+class StubBackend:
+    """Threaded stub server; `stats()` returns request and byte counts per route"""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stopping = threading.Event()
+        self._event_id = 0
+        self.started_at = datetime.now(timezone.utc)
+        self.devices = [f"ESP32_{i:03d}" for i in range(1, self.config.devices + 1)]
+        self.logs = _build_chain(self.config.log_count, self.started_at - timedelta(days=1))
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                backend._handle(self, "GET")
+
+            def do_POST(self):
+                backend._handle(self, "POST")
+
+            def do_DELETE(self):
+                backend._handle(self, "DELETE")
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Counters
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{route: {"requests": n, "bytes": n}} since the last reset"""
+        with self._lock:
+            return {route: dict(counts) for route, counts in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _count(self, route: str, size: int, requests: int = 1):
+        with self._lock:
+            counts = self._stats.setdefault(route, {"requests": 0, "bytes": 0})
+            counts["requests"] += requests
+            counts["bytes"] += size
+
+    # Routing
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        url = urlparse(handler.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = self._route_for(url.path)
+
+        delay = self.config.latency_ms + self._random.uniform(0, self.config.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000.0)
+
+        if url.path == STREAM_ENDPOINT and method == "GET" and self.config.stream_interval_ms:
+            self._stream(handler)
+            return
+
+        if route != "/health" and self._random.random() < self.config.error_rate:
+            status, body = 503, {"detail": "stub: injected failure"}
+        else:
+            status, body = self._respond(method, url.path, query)
+
+        payload = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+        self._count(route, len(payload))
+
+    def _stream(self, handler: BaseHTTPRequestHandler):
+        """
+        Server-sent events until the client disconnects: every
+        stream_interval_ms one sensor_reading per device, plus a heartbeat
+        comment. The request is counted on connect, bytes as they are sent.
+        """
+        handler.close_connection = True
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        self._count(STREAM_ENDPOINT, 0)
+        try:
+            while not self._stopping.is_set():
+                chunks = [": heartbeat\n\n"]
+                for device_id in self.devices:
+                    with self._lock:
+                        self._event_id += 1
+                        event_id = self._event_id
+                    reading = dict(self._readings(device_id, 1)[0], device_id=device_id)
+                    chunks.append(f"id: {event_id}\nevent: sensor_reading\ndata: {json.dumps(reading)}\n\n")
+                payload = "".join(chunks).encode("utf-8")
+                handler.wfile.write(payload)
+                handler.wfile.flush()
+                self._count(STREAM_ENDPOINT, len(payload), requests=0)
+                self._stopping.wait(self.config.stream_interval_ms / 1000.0)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    @staticmethod
+    def _route_for(path: str) -> str:
+        if path == STREAM_ENDPOINT:
+            return path
+        matches = [r for r in API_ROUTES if path == r or path.startswith(r + "/")]
+        return max(matches, key=len) if matches else path
+
+    def _respond(self, method: str, path: str, query: Dict[str, str]):
+        parts = path.strip("/").split("/")
+        device_id = parts[-1]
+
+        if path == "/health":
+            return 200, {"status": "healthy", "database": "connected", "blockchain": "ready"}
+        if path == STREAM_ENDPOINT:
+            return 404, {"detail": "stub: no event stream"}
+        if path == "/api/v1/dashboard/devices":
+            return 200, {"devices": self.devices}
+        if path.startswith("/api/v1/dashboard/data/"):
+            if not self.config.dashboard_endpoint:
+                return 501, {"detail": "Not implemented"}
+            return 200, {
+                "current_reading": self._readings(device_id, 1)[0],
+                "control_status": self._control(device_id),
+                "recent_logs": self._log_page({"limit": "10"})["logs"],
+                "system_health": {"status": "healthy"},
+            }
+        if path == "/api/v1/dashboard/blockchain/logs":
+            return 200, self._log_page(query)
+        if path.startswith("/api/v1/dashboard/analytics/"):
+            return 200, {"device_id": device_id, "hours": int(query.get("hours", 24)), "avg_pm25": 21.5}
+        if path.endswith("/batch"):
+            if not self.config.batch_endpoints:
+                return 404, {"detail": "Not Found"}
+            ids = [d for d in query.get("device_ids", "").split(",") if d]
+            if path.startswith("/api/v1/sensor/history"):
+                limit = int(query.get("limit", 50))
+                return 200, {"results": {d: self._readings(d, limit) for d in ids}}
+            if path.startswith("/api/v1/sensor/status"):
+                return 200, {"results": {d: self._status(d) for d in ids}}
+            return 200, {"results": {d: self._control(d) for d in ids}}
+        if path.startswith("/api/v1/sensor/status/"):
+            return 200, self._status(device_id)
+        if path.startswith("/api/v1/sensor/history/"):
+            readings = self._readings(device_id, int(query.get("limit", 50)), query.get("since"), query.get("until"))
+            return 200, {"device_id": device_id, "readings": readings}
+        if path.startswith("/api/v1/control/status/"):
+            return 200, self._control(device_id)
+        if path.startswith("/api/v1/control/override"):
+            if method == "POST":
+                return 200, {"device_id": query.get("device_id"), "override": True}
+            if method == "DELETE":
+                return 200, {"device_id": device_id, "override": False}
+        return 404, {"detail": "Not Found"}
+
+    # Payloads
+    def _readings(self, device_id: str, limit: int, since: Optional[str] = None,
+                  until: Optional[str] = None) -> List[Dict]:
+        """
+        Newest `limit` readings at 1 s spacing ending now, newest first
+        Only readings strictly newer than `since` and older than `until`
+        """
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        first, end = 0, self.config.history_size  # reading i is i seconds old
+        if until:
+            first = max(math.floor((now - _parse(until)).total_seconds()) + 1, 0)
+        if since:
+            end = min(end, math.ceil((now - _parse(since)).total_seconds()))
+        offset = sum(map(ord, device_id)) % 17
+        readings = []
+        for i in range(first, min(first + limit, end)):
+            t = int((now - timedelta(seconds=i)).timestamp())
+            readings.append({
+                "timestamp": _iso(now - timedelta(seconds=i)),
+                "pm25": round(12 + offset + (t % 60) / 4, 1),
+                "co2": 600 + offset * 10 + t % 50,
+                "co": round(1 + (t % 20) / 10, 2),
+                "voc": 150 + t % 30,
+            })
+        return readings
+
+    def _status(self, device_id: str) -> Dict[str, Any]:
+        return {"device_id": device_id, "online": True, "latest_reading": self._readings(device_id, 1)[0]}
+
+    @staticmethod
+    def _control(device_id: str) -> Dict[str, Any]:
+        return {"device_id": device_id, "fan_on": True, "fan_intensity": 60, "is_override": False}
+
+    def _log_page(self, query: Dict[str, str]) -> Dict[str, Any]:
+        logs = self.logs[::-1]
+        if query.get("event_type"):
+            types = set(query["event_type"].split(","))
+            logs = [log for log in logs if log["event_type"] in types]
+        if query.get("device_id"):
+            logs = [log for log in logs if log["device_id"] == query["device_id"]]
+        if query.get("since"):
+            logs = [log for log in logs if log["timestamp"] >= query["since"]]
+        if query.get("until"):
+            logs = [log for log in logs if log["timestamp"] <= query["until"]]
+        offset, limit = int(query.get("cursor") or 0), int(query.get("limit", 20))
+        page = logs[offset:offset + limit]
+        more = offset + limit < len(logs)
+        return {"logs": page, "next_cursor": str(offset + limit) if more else None}
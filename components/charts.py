@@ -4,55 +4,29 @@ Chart Components using Plotly
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import List, Dict
-import pandas as pd
+import numpy as np
+from functools import lru_cache
+from typing import List, Dict, Union, Optional
 
+from services.instrumentation import metrics
+from utils.aqi import aqi_category, compute_aqi_scalar
+from utils.constants import WEBGL_POINT_THRESHOLD, HISTORY_CHART_WIDTH_PX, AQI_BREAKPOINTS, AQI_CATEGORIES, AQI_MAX
+from utils.downsampling import downsample_columns, target_points
+from utils.reading_store import ReadingColumns, ReadingStore
 
-def sensor_history_chart(readings: List[Dict]):
-    """Display sensor history as line chart"""
-    if not readings:
-        st.info("No historical data available")
-        return
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(readings)
-    
-    # Ensure timestamp is datetime
-    if 'timestamp' in df.columns:
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-    
-    # Create figure with secondary y-axis
-    fig = go.Figure()
-    
-    # Add traces
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['pm25'],
-        name='PM2.5 (µg/m³)',
-        line=dict(color='#FF5252', width=2)
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['co2'],
-        name='CO2 (ppm)',
-        line=dict(color='#00D9FF', width=2),
-        yaxis='y2'
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['co'],
-        name='CO (ppm)',
-        line=dict(color='#FFB300', width=2)
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['voc'],
-        name='VOC (ppb)',
-        line=dict(color='#00C853', width=2),
-        yaxis='y2'
-    ))
-    
-    # Update layout
-    fig.update_layout(
+# (column, legend name, color, y-axis) for each sensor trace
+HISTORY_TRACES = (
+    ('pm25', 'PM2.5 (µg/m³)', '#FF5252', 'y'),
+    ('co2', 'CO2 (ppm)', '#00D9FF', 'y2'),
+    ('co', 'CO (ppm)', '#FFB300', 'y'),
+    ('voc', 'VOC (ppb)', '#00C853', 'y2'),
+)
+
+
+@lru_cache(maxsize=1)
+def _history_layout() -> go.Layout:
+    """Sensor history layout, built and validated once per process"""
+    return go.Layout(
         title='Sensor Readings Over Time',
         xaxis_title='Time',
         yaxis_title='PM2.5 & CO (ppm)',
@@ -64,6 +38,8 @@ def sensor_history_chart(readings: List[Dict]):
         hovermode='x unified',
         template='plotly_dark',
         height=400,
+        # Keeps the user's zoom/pan and legend toggles across data refreshes
+        uirevision='sensor_history',
         legend=dict(
             orientation="h",
             yanchor="bottom",
@@ -72,34 +48,86 @@ def sensor_history_chart(readings: List[Dict]):
             x=1
         )
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
 
-def aqi_gauge(pm25_value: float):
-    """Display AQI as gauge chart"""
-    from utils.formatters import get_aqi_category
+def _history_figure(webgl: bool) -> go.Figure:
+    """Empty sensor history figure on the cached layout"""
+    trace_type = go.Scattergl if webgl else go.Scatter
+    return go.Figure(
+        data=[
+            trace_type(name=name, line=dict(color=color, width=2), yaxis=yaxis)
+            for _, name, color, yaxis in HISTORY_TRACES
+        ],
+        layout=_history_layout()
+    )
+
+
+def sensor_history_chart(readings: Union[ReadingColumns, List[Dict]], key: str = "sensor_history",
+                         width_px: int = HISTORY_CHART_WIDTH_PX):
+    """
+    Display sensor history as line chart
+    The figure is kept per session and only its trace data is replaced on
+    refresh; traces switch to WebGL above WEBGL_POINT_THRESHOLD points.
+    Windows longer than the chart's pixel width are downsampled (min/max +
+    LTTB) so peaks survive and render cost stays flat.
+    """
+    if readings is None or not len(readings):
+        st.info("No historical data available")
+        return
+    
+    # Columnar views feed Plotly directly; plain lists are converted once
+    if not isinstance(readings, ReadingColumns):
+        readings = ReadingStore.from_readings(readings).columns()
+    
+    n_out = target_points(width_px)
+    columns = {column: getattr(readings, column) for column, _, _, _ in HISTORY_TRACES}
+    if len(readings) > n_out:
+        series = downsample_columns(readings.timestamp, columns, n_out)
+    else:
+        series = {column: (readings.timestamp, values) for column, values in columns.items()}
+    
+    webgl = len(next(iter(series.values()))[0]) > WEBGL_POINT_THRESHOLD
+    state_key = f"_figure_{key}"
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] != webgl:
+        cached = (webgl, _history_figure(webgl))
+        st.session_state[state_key] = cached
+    fig = cached[1]
     
-    category, color = get_aqi_category(pm25_value)
+    # Bands stop at the primary axis' data max - shapes count towards autorange
+    primary = [series[column][1] for column, _, _, yaxis in HISTORY_TRACES if yaxis == 'y']
+    with np.errstate(all="ignore"):
+        y_max = max((float(np.nanmax(values)) for values in primary if len(values)), default=float("nan"))
+    
+    with fig.batch_update():
+        for trace, (column, _, _, _) in zip(fig.data, HISTORY_TRACES):
+            trace.x, trace.y = series[column]
+        fig.layout.shapes = _pm25_band_shapes(y_max)
+    
+    # Figure serialization dominates large charts, so it is timed on its own
+    with metrics.render_timer("charts", f"{key}.serialize"):
+        st.plotly_chart(fig, use_container_width=True, key=key)
+
+
+def aqi_gauge(pm25_value: float, co_value: Optional[float] = None):
+    """Display EPA AQI (from PM2.5, and CO when given) as gauge chart"""
+    aqi, dominant = compute_aqi_scalar(pm25=pm25_value, co=co_value)
+    aqi = aqi or 0
+    category, color = aqi_category(aqi)
+    pollutant = {"pm25": "PM2.5", "co": "CO"}.get(dominant, "PM2.5")
     
     fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=pm25_value,
+        mode="gauge+number",
+        value=aqi,
         domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': f"PM2.5 Air Quality<br><span style='font-size:0.8em;color:gray'>{category}</span>"},
+        title={'text': f"Air Quality Index<br><span style='font-size:0.8em;color:gray'>{category} ({pollutant})</span>"},
         gauge={
-            'axis': {'range': [None, 300], 'tickwidth': 1, 'tickcolor': "white"},
+            'axis': {'range': [0, AQI_MAX], 'tickwidth': 1, 'tickcolor': "white"},
             'bar': {'color': color},
             'bgcolor': "white",
             'borderwidth': 2,
             'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 12], 'color': '#00C85330'},
-                {'range': [12, 35.5], 'color': '#00D9FF30'},
-                {'range': [35.5, 55.5], 'color': '#FFB30030'},
-                {'range': [55.5, 150.5], 'color': '#FF525230'},
-                {'range': [150.5, 300], 'color': '#FF000030'}
-            ],
+            'steps': _aqi_gauge_steps(),
             'threshold': {
                 'line': {'color': "red", 'width': 4},
                 'thickness': 0.75,
@@ -117,6 +145,34 @@ def aqi_gauge(pm25_value: float):
     st.plotly_chart(fig, use_container_width=True)
 
 
+@lru_cache(maxsize=1)
+def _aqi_gauge_steps() -> tuple:
+    """Gauge background bands, one per AQI category"""
+    steps, lower = [], 0
+    for upper, _, color in AQI_CATEGORIES:
+        steps.append({'range': [lower, upper], 'color': f'{color}30'})
+        lower = upper
+    return tuple(steps)
+
+
+def _pm25_band_shapes(y_max: float) -> tuple:
+    """
+    Faint horizontal bands marking PM2.5 AQI categories on the primary
+    y-axis, clipped at `y_max` so they never stretch the axis (none for NaN)
+    """
+    _, _, rows = AQI_BREAKPOINTS["pm25"]
+    shapes = []
+    for (c_lo, c_hi, _, i_hi) in rows:
+        if not c_lo < y_max:
+            break
+        _, color = aqi_category(i_hi)
+        shapes.append(dict(
+            type='rect', xref='paper', yref='y', x0=0, x1=1, y0=c_lo, y1=min(c_hi, y_max),
+            fillcolor=color, opacity=0.06, line_width=0, layer='below'
+        ))
+    return tuple(shapes)
+
+
 def fan_intensity_bar(intensity: int):
     """Display fan intensity as horizontal bar"""
     fig = go.Figure(go.Bar(
@@ -0,0 +1,36 @@
+"""
+Debug Panel Component
+Per-endpoint backend latency and per-section render timings (in-app view of
+the instrumentation registry)
+"""
+import os
+import streamlit as st
+
+
+def debug_panel_enabled() -> bool:
+    """Shown when DEBUG_PANEL=true or the page URL has ?debug=1"""
+    if os.getenv("DEBUG_PANEL", "false").lower() == "true":
+        return True
+    return st.query_params.get("debug") in ("1", "true")
+
+
+def debug_panel(registry):
+    """Display backend call and section render tables plus the Prometheus export"""
+    with st.expander("Performance Debug", expanded=False):
+        endpoints = registry.endpoint_summary()
+        sections = registry.render_summary()
+
+        st.markdown("**Backend calls** (since process start)")
+        if endpoints:
+            st.dataframe(endpoints, use_container_width=True, hide_index=True)
+        else:
+            st.caption("No backend calls recorded yet")
+
+        st.markdown("**Section renders**")
+        if sections:
+            st.dataframe(sections, use_container_width=True, hide_index=True)
+        else:
+            st.caption("No section renders recorded yet")
+
+        st.download_button("Download Prometheus metrics", registry.prometheus_text(),
+                           file_name="vayu_metrics.prom", mime="text/plain")
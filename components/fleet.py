@@ -0,0 +1,67 @@
+"""
+Fleet Overview Components
+Device tiles rendered as one HTML grid (one element for the whole fleet)
+"""
+import html
+import time
+import streamlit as st
+import numpy as np
+from typing import Dict, Optional, Any
+
+from utils.constants import COLOR_DANGER
+
+
+def sparkline_svg(values: Optional[np.ndarray], color: str, width: int = 120, height: int = 28) -> str:
+    """Inline SVG polyline of a short series (gaps skipped)"""
+    if values is None:
+        return ""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return ""
+    lo, hi = values.min(), values.max()
+    span = (hi - lo) or 1.0
+    xs = np.linspace(1, width - 1, len(values))
+    ys = height - 2 - (values - lo) / span * (height - 4)
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5"/></svg>')
+
+
+def _tile_html(device_id: str, tile: Optional[Dict[str, Any]], now: float) -> str:
+    name = html.escape(device_id)
+    if not tile or "reading" not in tile:
+        status = "Backend error" if tile and tile.get("error") else "Loading..."
+        return (f'<div class="fleet-tile" style="border-color: #444;">'
+                f'<div class="fleet-id">{name}</div><div class="fleet-sub">{status}</div></div>')
+
+    reading, color = tile["reading"], tile["color"]
+    pm25, co2 = reading.get("pm25"), reading.get("co2")
+    aqi = tile["aqi"] if tile["aqi"] is not None else "-"
+    age = f"{now - tile['fetched_at']:.0f}s ago"
+    stale = f' <span style="color: {COLOR_DANGER};">(stale)</span>' if tile.get("error") else ""
+    return (
+        f'<div class="fleet-tile" style="border-color: {color};">'
+        f'<div class="fleet-id">{name}</div>'
+        f'<div class="fleet-aqi" style="color: {color};">AQI {aqi} <span class="fleet-sub">{html.escape(tile["category"])}</span></div>'
+        f'<div class="fleet-sub">PM2.5 {pm25 if pm25 is None else f"{pm25:.1f}"} · CO2 {co2 if co2 is None else f"{co2:.0f}"}</div>'
+        f'{sparkline_svg(tile.get("sparkline"), color)}'
+        f'<div class="fleet-sub">{age}{stale}</div>'
+        f'</div>'
+    )
+
+
+def fleet_grid(tiles: Dict[str, Optional[Dict[str, Any]]]):
+    """Display device tiles (in the given order) as a responsive grid"""
+    now = time.time()
+    body = "".join(_tile_html(device_id, tile, now) for device_id, tile in tiles.items())
+    st.markdown(f"""
+        <style>
+        .fleet-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(150px, 1fr)); gap: 8px; }}
+        .fleet-tile {{ background: #111; border-left: 4px solid; border-radius: 6px; padding: 8px; }}
+        .fleet-id {{ color: #FFF; font-size: 13px; font-weight: 600; }}
+        .fleet-aqi {{ font-size: 18px; font-weight: 700; }}
+        .fleet-sub {{ color: #888; font-size: 11px; font-weight: 400; }}
+        </style>
+        <div class="fleet-grid">{body}</div>
+    """, unsafe_allow_html=True)
@@ -2,7 +2,7 @@
 Reusable Metric Display Components
 """
 import streamlit as st
-from typing import Optional
+from typing import Optional, Dict
 
 
 def metric_card(label: str, value: str, unit: str = "", delta: Optional[str] = None, color: str = "#00D9FF"):
@@ -35,30 +35,47 @@ def metric_card(label: str, value: str, unit: str = "", delta: Optional[str] = N
     """, unsafe_allow_html=True)
 
 
-def sensor_metric_row(pm25: float, co2: float, co: float, voc: float):
-    """Display all sensor metrics in a row"""
-    from utils.formatters import get_aqi_category
-    from utils.constants import COLOR_INFO, COLOR_WARNING
+def trend_delta(value: float, stats: Optional[Dict], window: str, decimals: int = 1) -> Optional[str]:
+    """Change of `value` against a rolling window's mean, e.g. "▲ 2.5 vs 1h avg" """
+    if not stats or stats.get("mean") is None:
+        return None
+    change = round(value - stats["mean"], decimals)
+    arrow = "▲" if change > 0 else "▼" if change < 0 else "="
+    return f"{arrow} {abs(change):.{decimals}f} vs {window} avg"
+
+
+def sensor_metric_row(pm25: float, co2: float, co: float, voc: float, analytics: Optional[Dict] = None):
+    """
+    Display all sensor metrics in a row
+    `analytics` ({window: {sensor: stats}}) adds a trend delta to every card
+    """
+    from utils.aqi import aqi_category, sub_index_scalar
+    from utils.constants import COLOR_INFO, COLOR_WARNING, ROLLING_DELTA_WINDOW
     
+    window = ROLLING_DELTA_WINDOW
+    stats = (analytics or {}).get(window, {})
     col1, col2, col3, col4 = st.columns(4)
     
-    # PM2.5 with AQI category
-    category, color = get_aqi_category(pm25)
+    # PM2.5 with EPA AQI and category
+    pm25_aqi = sub_index_scalar("pm25", pm25)
+    category, color = aqi_category(pm25_aqi)
+    pm25_delta = f"AQI {pm25_aqi} - {category}" if pm25_aqi is not None else category
+    pm25_trend = trend_delta(pm25, stats.get("pm25"), window)
     with col1:
-        metric_card("PM2.5", f"{pm25:.1f}", "µg/m³", category, color)
+        metric_card("PM2.5", f"{pm25:.1f}", "µg/m³", f"{pm25_delta} · {pm25_trend}" if pm25_trend else pm25_delta, color)
     
     # CO2
     co2_color = COLOR_WARNING if co2 > 1000 else COLOR_INFO
     with col2:
-        metric_card("CO2", f"{co2:.0f}", "ppm", color=co2_color)
+        metric_card("CO2", f"{co2:.0f}", "ppm", trend_delta(co2, stats.get("co2"), window, 0), color=co2_color)
     
     # CO
     with col3:
-        metric_card("CO", f"{co:.1f}", "ppm", color=COLOR_INFO)
+        metric_card("CO", f"{co:.1f}", "ppm", trend_delta(co, stats.get("co"), window), color=COLOR_INFO)
     
     # VOC
     with col4:
-        metric_card("VOC", f"{voc:.0f}", "ppb", color=COLOR_INFO)
+        metric_card("VOC", f"{voc:.0f}", "ppb", trend_delta(voc, stats.get("voc"), window, 0), color=COLOR_INFO)
 
 
 def large_metric(label: str, value: str, icon: str = "", color: str = "#00D9FF"):
@@ -0,0 +1,48 @@
+"""
+Pagination Components
+"""
+import math
+import streamlit as st
+from typing import Tuple
+
+
+def current_page(key: str) -> int:
+    """1-based page stored under `key` (already moved by this run's button click)"""
+    return max(st.session_state.get(key, 1), 1)
+
+
+def _shift_page(key: str, step: int):
+    st.session_state[key] = current_page(key) + step
+
+
+def paginate(total: int, page_size: int, key: str, has_more: bool = False) -> Tuple[int, int]:
+    """
+    Render page controls and return the (start, end) slice of the visible page
+    The current page lives in session_state under `key` and is clamped when
+    the total shrinks (e.g. after a filter change). With `has_more` the total
+    is open-ended (cursor-paged data): one more page stays reachable.
+    Buttons move the page in on_click callbacks, so `current_page` already
+    reflects the click before anything is fetched.
+    """
+    pages = max(math.ceil(total / page_size) + (1 if has_more else 0), 1)
+    page = min(current_page(key), pages)
+    st.session_state[key] = page
+    more = "+" if has_more else ""
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("Previous", key=f"{key}_prev", disabled=page <= 1, use_container_width=True,
+                  on_click=_shift_page, args=(key, -1))
+    with col_next:
+        st.button("Next", key=f"{key}_next", disabled=page >= pages, use_container_width=True,
+                  on_click=_shift_page, args=(key, 1))
+
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    with col_info:
+        st.markdown(
+            f"<div style='text-align: center; color: #AAAAAA; padding-top: 8px;'>"
+            f"Page {page} of {pages}{more} &middot; entries {start + 1 if end > start else 0}-{end} of {total}{more}</div>",
+            unsafe_allow_html=True
+        )
+    return start, end
@@ -2,16 +2,20 @@
 Dashboard Page - Real-time Air Quality Monitoring
 """
 import streamlit as st
-import time
 import os
+import uuid
 from datetime import datetime
 from dotenv import load_dotenv
 
 from services.api_client import api_client
+from services.data_service import data_service
+from services.instrumentation import metrics, timed_section
 from components.metrics import sensor_metric_row
 from components.status_cards import prediction_card, classification_card, fault_card, control_card
 from components.charts import sensor_history_chart, aqi_gauge
 from components.alerts import error_alert, warning_alert, info_alert
+from components.debug_panel import debug_panel, debug_panel_enabled
+from utils.constants import AGGREGATION_DEADLINE, LIVE_FRAGMENT_INTERVAL, AI_FRAGMENT_INTERVALS, HISTORY_WINDOWS
 
 # Load environment
 load_dotenv()
@@ -56,14 +60,13 @@ st.markdown("<p style='color: #AAAAAA;'>Monitoring air quality, AI predictions,
 col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
 with col1:
     try:
-        devices = api_client.get_devices()
+        devices = data_service.get_devices()
         selected_device = st.selectbox("Device Selection", devices if devices else ["ESP32_001"])
     except:
         selected_device = st.text_input("Device ID", value="ESP32_001")
 
 with col2:
     auto_refresh = st.checkbox("Enable Auto-refresh", value=True)
-    refresh_interval = 5
 
 with col3:
     if st.button("Trigger Manual Refresh", use_container_width=True):
@@ -72,29 +75,158 @@ with col3:
 st.markdown("---")
 
 # DATA RETRIEVAL (The "Opportunity" to link backend data)
-dashboard_data = {}
-fetch_error = None
-try:
-    # This is where the backend linking happens
-    dashboard_data = api_client.get_aggregated_dashboard_data(selected_device)
-except Exception as e:
-    fetch_error = str(e)
+# Sessions share one process-wide poller per device instead of each calling the backend
+if "viewer_id" not in st.session_state:
+    st.session_state.viewer_id = uuid.uuid4().hex
+data_service.subscribe(selected_device, st.session_state.viewer_id)
+data_service.get_snapshot(selected_device, wait=AGGREGATION_DEADLINE)
 
-# 1. Real-Time Sensor Data Section (Heading is Permanent)
-st.subheader("Real-Time Sensor Data (ESP32)")
-sensor_container = st.container()
-with sensor_container:
-    current_reading = dashboard_data.get("current_reading")
+
+def load_snapshot() -> dict:
+    """Latest shared snapshot for the selected device (renews this viewer's lease)"""
+    data_service.subscribe(selected_device, st.session_state.viewer_id)
+    return data_service.get_snapshot(selected_device) or {}
+
+
+# Live sections are fragments: each reruns on its own schedule while the page
+# shell above (CSS, nav, device list) is only rebuilt on a full rerun
+def fragment_interval(seconds: float):
+    return seconds if auto_refresh else None
+
+
+@st.fragment(run_every=fragment_interval(LIVE_FRAGMENT_INTERVAL))
+@timed_section("dashboard", "sensor_row")
+def render_sensor_section():
+    """1. Real-Time Sensor Data Section"""
+    snapshot = load_snapshot()
+    current_reading = (snapshot.get("dashboard_data") or {}).get("current_reading")
     if current_reading:
         sensor_metric_row(
             pm25=current_reading.get("pm25", 0),
             co2=current_reading.get("co2", 0),
             co=current_reading.get("co", 0),
-            voc=current_reading.get("voc", 0)
+            voc=current_reading.get("voc", 0),
+            analytics=snapshot.get("analytics")
         )
     else:
         st.info("Reading live data stream... (Waiting for sensor connection)")
 
+
+@st.fragment(run_every=fragment_interval(LIVE_FRAGMENT_INTERVAL))
+@timed_section("dashboard", "aqi_gauge")
+def render_aqi_section():
+    """2a. AQI gauge"""
+    current_reading = (load_snapshot().get("dashboard_data") or {}).get("current_reading")
+    if current_reading:
+        aqi_gauge(current_reading.get("pm25", 0), current_reading.get("co"))
+    else:
+        st.caption("Awaiting data for AQI calculation")
+
+
+@st.fragment(run_every=fragment_interval(data_service.interval))
+@timed_section("dashboard", "history_chart")
+def render_history_section():
+    """2b. Historical sensor trends (live buffer, or a window from the local archive)"""
+    window = "Live"
+    if data_service.archive is not None:
+        window = st.radio("Window", list(HISTORY_WINDOWS), horizontal=True, label_visibility="collapsed")
+    hours = HISTORY_WINDOWS[window]
+    if hours:
+        load_snapshot()
+        history = data_service.get_history_window(selected_device, hours)
+    else:
+        history = load_snapshot().get("history")
+    if history is None:
+        st.caption("Trend visualization unavailable")
+    elif history:
+        sensor_history_chart(history)
+    else:
+        st.caption("Gathering historical data points...")
+
+
+@st.fragment(run_every=fragment_interval(data_service.interval * AI_FRAGMENT_INTERVALS))
+@timed_section("dashboard", "ai_cards")
+def render_ai_section():
+    """3. Gen-AI Agent Predictions Section"""
+    dashboard_data = load_snapshot().get("dashboard_data") or {}
+    col_ai1, col_ai2 = st.columns(2)
+
+    with col_ai1:
+        prediction = dashboard_data.get("prediction")
+        if prediction:
+            prediction_card(
+                will_peak=prediction.get("will_peak", False),
+                confidence=prediction.get("confidence", 0),
+                reasoning=prediction.get("reasoning", "Analysis in progress..."),
+                estimated_peak=prediction.get("estimated_peak_value")
+            )
+        else:
+            info_alert("Agent is analyzing environment for smoke risk...")
+
+    with col_ai2:
+        classification = dashboard_data.get("classification")
+        if classification:
+            classification_card(
+                air_type=classification.get("air_type", "unknown"),
+                confidence=classification.get("confidence", 0),
+                reasoning=classification.get("reasoning", "Identifying pollution sources...")
+            )
+        else:
+            info_alert("Agent is classifying current air components...")
+
+
+@st.fragment(run_every=fragment_interval(LIVE_FRAGMENT_INTERVAL))
+@timed_section("dashboard", "health_control")
+def render_health_section():
+    """4. System Health & Control Section, plus the sync status footer"""
+    snapshot = load_snapshot()
+    dashboard_data = snapshot.get("dashboard_data") or {}
+    col_ctrl1, col_ctrl2 = st.columns(2)
+
+    with col_ctrl1:
+        recent_faults = dashboard_data.get("recent_faults", [])
+        if recent_faults:
+            latest_fault = recent_faults[0]
+            fault_card(
+                has_fault=latest_fault.get("has_fault", False),
+                fault_type=latest_fault.get("fault_type", "no_fault"),
+                severity=latest_fault.get("severity", "low"),
+                details=latest_fault.get("details", ""),
+                affected_sensor=latest_fault.get("affected_sensor")
+            )
+        else:
+            fault_card(has_fault=False, fault_type="no_fault", severity="low", details="Monitoring hardware integrity...")
+
+    with col_ctrl2:
+        control_status = dashboard_data.get("control_status")
+        if control_status:
+            control_card(
+                fan_on=control_status.get("fan_on", False),
+                fan_intensity=control_status.get("fan_intensity", 0),
+                is_override=False # Default to auto
+            )
+        else:
+            info_alert("Fan control synchronization in progress...")
+
+    # Footer Status
+    fetch_error = snapshot.get("error") if snapshot else "Waiting for first data snapshot"
+    partial_errors = dashboard_data.get("system_health", {}).get("errors", {})
+    if fetch_error:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.warning(f"Backend Sync: {fetch_error}")
+    elif partial_errors:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.caption("Partial data - unavailable: " + ", ".join(sorted(partial_errors)))
+
+    open_breakers = api_client.breaker_states()
+    if open_breakers:
+        st.caption("Backend degraded - serving last known data for: " + ", ".join(sorted(open_breakers)))
+
+
+# 1. Real-Time Sensor Data Section (Heading is Permanent)
+st.subheader("Real-Time Sensor Data (ESP32)")
+render_sensor_section()
+
 st.markdown("---")
 
 # 2. AQI and Trends Section
@@ -102,88 +234,25 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Air Quality Index (AQI)")
-    if current_reading:
-        aqi_gauge(current_reading.get("pm25", 0))
-    else:
-        st.caption("Awaiting data for AQI calculation")
+    render_aqi_section()
 
 with col2:
     st.subheader("Historical Sensor Trends")
-    try:
-        history = api_client.get_sensor_history(selected_device, limit=20)
-        if history:
-            sensor_history_chart(history)
-        else:
-            st.caption("Gathering historical data points...")
-    except:
-        st.caption("Trend visualization unavailable")
+    render_history_section()
 
 st.markdown("---")
 
 # 3. Gen-AI Agent Predictions Section
 st.subheader("Gen-AI Agent Predictions")
-col_ai1, col_ai2 = st.columns(2)
-
-with col_ai1:
-    prediction = dashboard_data.get("prediction")
-    if prediction:
-        prediction_card(
-            will_peak=prediction.get("will_peak", False),
-            confidence=prediction.get("confidence", 0),
-            reasoning=prediction.get("reasoning", "Analysis in progress..."),
-            estimated_peak=prediction.get("estimated_peak_value")
-        )
-    else:
-        info_alert("Agent is analyzing environment for smoke risk...")
-
-with col_ai2:
-    classification = dashboard_data.get("classification")
-    if classification:
-        classification_card(
-            air_type=classification.get("air_type", "unknown"),
-            confidence=classification.get("confidence", 0),
-            reasoning=classification.get("reasoning", "Identifying pollution sources...")
-        )
-    else:
-        info_alert("Agent is classifying current air components...")
+render_ai_section()
 
 st.markdown("---")
 
 # 4. System Health & Control Section
 st.subheader("System Health & Control")
-col_ctrl1, col_ctrl2 = st.columns(2)
-
-with col_ctrl1:
-    recent_faults = dashboard_data.get("recent_faults", [])
-    if recent_faults:
-        latest_fault = recent_faults[0]
-        fault_card(
-            has_fault=latest_fault.get("has_fault", False),
-            fault_type=latest_fault.get("fault_type", "no_fault"),
-            severity=latest_fault.get("severity", "low"),
-            details=latest_fault.get("details", ""),
-            affected_sensor=latest_fault.get("affected_sensor")
-        )
-    else:
-        fault_card(has_fault=False, fault_type="no_fault", severity="low", details="Monitoring hardware integrity...")
-
-with col_ctrl2:
-    control_status = dashboard_data.get("control_status")
-    if control_status:
-        control_card(
-            fan_on=control_status.get("fan_on", False),
-            fan_intensity=control_status.get("fan_intensity", 0),
-            is_override=False # Default to auto
-        )
-    else:
-        info_alert("Fan control synchronization in progress...")
-
-# Footer Status
-if fetch_error:
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.warning(f"Backend Sync: {fetch_error}")
+render_health_section()
 
-# Auto-refresh logic
-if auto_refresh:
-    time.sleep(refresh_interval)
-    st.rerun()
+# Optional hot-path metrics (DEBUG_PANEL=true or ?debug=1)
+if debug_panel_enabled():
+    st.markdown("---")
+    debug_panel(metrics)
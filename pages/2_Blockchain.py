@@ -3,13 +3,17 @@ Blockchain Logs Page
 View immutable blockchain transaction logs
 """
 import streamlit as st
-import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from services.api_client import api_client
+from services.api_client import api_client, latency_budget
+from services.data_service import data_service
+from services.log_cache import log_cache
+from services.chain_verifier import chain_verifier, VERIFIED, PENDING, TAMPERED, BROKEN, UNVERIFIABLE
 from components.alerts import error_alert, info_alert
-from utils.constants import EVENT_TYPES
+from components.pagination import paginate, current_page
+from utils.constants import EVENT_TYPES, PAGE_LATENCY_BUDGET, LOG_PAGE_SIZE, LOG_TIME_RANGES, LOG_CACHE_SYNC_WAIT
 from utils.formatters import format_timestamp
+from utils.log_frame import build_log_frame, event_counts
 
 # Page config
 st.set_page_config(page_title="Blockchain Logs - VAYU AI", layout="wide")
@@ -47,10 +51,10 @@ render_top_nav()
 st.title("Blockchain Transaction Logs")
 st.markdown("<p style='color: #AAAAAA;'>View immutable records of critical system events</p>", unsafe_allow_html=True)
 
-# Filter Controls Row (instead of sidebar)
-col1, col2, col3 = st.columns([2, 3, 1])
+# Filter Controls Row (instead of sidebar) - filters are applied by the backend
+col1, col2, col3, col4, col5 = st.columns([2, 3, 2, 2, 1])
 with col1:
-    log_limit = st.slider("Number of logs", 10, 100, 20, 10)
+    page_size = st.slider("Logs per page", 10, 100, LOG_PAGE_SIZE, 10)
 
 with col2:
     event_filter = st.multiselect(
@@ -60,53 +64,183 @@ with col2:
     )
 
 with col3:
+    try:
+        devices = data_service.get_devices()
+    except Exception:
+        devices = []
+    device_filter = st.selectbox("Device", ["All devices"] + list(devices))
+
+with col4:
+    time_range = st.selectbox("Time Range", list(LOG_TIME_RANGES))
+
+with col5:
     st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("Refresh Logs", use_container_width=True):
-        st.rerun()
+    refresh = st.button("Refresh Logs", use_container_width=True)
 
 st.markdown("---")
 
+
+def log_filters() -> dict:
+    """Backend query for the selected filters (all event types selected = no filter)"""
+    hours = LOG_TIME_RANGES[time_range]
+    since = None
+    if hours:
+        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat().replace('+00:00', 'Z')
+    return {
+        "event_types": event_filter if set(event_filter) != set(EVENT_TYPES) else None,
+        "device_id": None if device_filter == "All devices" else device_filter,
+        "since": since,
+    }
+
+
+def reset_page_on_filter_change() -> bool:
+    """Back to page 1 whenever the filters or page size change; True if they did"""
+    query = (page_size, tuple(sorted(event_filter)), device_filter, time_range)
+    if st.session_state.get("log_query") != query:
+        st.session_state.log_query = query
+        st.session_state.log_page = 1
+        st.session_state.pop("remote_logs", None)
+        return True
+    return False
+
+
+def load_remote_logs(page: int) -> dict:
+    """
+    Logs fetched so far for the current filters, pulled page by page from the
+    client's cursor generator until `page` can be shown; earlier pages stay
+    in session state so paging back never refetches
+    """
+    cache = st.session_state.get("remote_logs")
+    if refresh or cache is None:
+        cache = {
+            "logs": [],
+            "pages": api_client.iter_blockchain_logs(page_size=page_size, **log_filters()),
+            "has_more": True,
+            "frame": build_log_frame([]),
+        }
+        st.session_state.remote_logs = cache
+        st.session_state.log_page = page = 1
+    
+    fetched = False
+    while cache["has_more"] and len(cache["logs"]) < page * page_size:
+        try:
+            cache["logs"].extend(next(cache["pages"]))
+            fetched = True
+        except StopIteration:
+            cache["has_more"] = False
+        except Exception:
+            # A generator that raised is finished - start over on the next run
+            del st.session_state.remote_logs
+            raise
+    # One typed frame per fetch feeds the counts, cards and table
+    if fetched:
+        cache["frame"] = build_log_frame(cache["logs"])
+    return {
+        "counts": event_counts(cache["frame"]),
+        "total": len(cache["frame"]),
+        "has_more": cache["has_more"],
+        "rows": lambda start, end: (cache["logs"][start:end], cache["frame"].iloc[start:end]),
+    }
+
+
+def with_frame(logs: list) -> tuple:
+    return logs, build_log_frame(logs)
+
+
+def load_cached_logs(new_query: bool) -> dict:
+    """
+    Logs answered from the local cache; the backend sync runs in the
+    background and is only waited on briefly for a new query (fully when the
+    cache is empty or on Refresh), so paging and toggles never wait on it
+    """
+    if refresh or log_cache.newest_timestamp() is None:
+        wait = PAGE_LATENCY_BUDGET
+    else:
+        wait = LOG_CACHE_SYNC_WAIT if new_query else 0
+    synced = log_cache.sync_in_background(wait)
+    filters = log_filters()
+    counts = log_cache.counts(**filters)
+    return {
+        "counts": counts,
+        "total": sum(counts.values()),
+        "has_more": False,
+        "rows": lambda start, end: with_frame(log_cache.query(end - start, start, **filters)),
+        "synced": synced,
+    }
+
+
+# Integrity badge (color, label) per verifier status
+INTEGRITY_BADGES = {
+    VERIFIED: ("green", "Verified"),
+    PENDING: ("gray", "Pending"),
+    TAMPERED: ("red", "Hash mismatch"),
+    BROKEN: ("red", "Broken link"),
+    UNVERIFIABLE: ("orange", "Unverifiable"),
+}
+
+
+def integrity_badge(status: str) -> str:
+    color, label = INTEGRITY_BADGES[status]
+    return f":{color}[{label}]"
+
+
 # Fetch and display logs
 try:
-    with st.spinner("Loading blockchain logs..."):
-        logs = api_client.get_blockchain_logs(limit=log_limit)
+    new_query = reset_page_on_filter_change()
+    with st.spinner("Loading blockchain logs..."), latency_budget(PAGE_LATENCY_BUDGET):
+        if log_cache is not None:
+            view = load_cached_logs(new_query)
+        else:
+            view = load_remote_logs(current_page("log_page"))
+    # Only entries added since the last verified one are hashed, off the script thread
+    chain_verifier.sync_in_background()
+    counts = view["counts"]
+    
+    if log_cache is not None and log_cache.last_error:
+        st.caption("Backend unreachable - showing cached logs")
+    elif not view.get("synced", True):
+        st.caption("Syncing with the backend - newer logs appear on the next refresh")
     
-    if not logs:
+    if not view["total"]:
         info_alert("No blockchain logs found")
     else:
-        # Filter by event type
-        if event_filter:
-            logs = [log for log in logs if log.get("event_type") in event_filter]
-        
-        st.success(f"Loaded {len(logs)} blockchain logs")
+        if log_cache is not None:
+            st.success(f"{view['total']} blockchain logs match (local cache)")
+        else:
+            st.success(f"Loaded {view['total']} blockchain logs" + (" (more available)" if view["has_more"] else ""))
         
         # Display summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
-        decision_count = sum(1 for log in logs if log.get("event_type") == "decision")
-        fault_count = sum(1 for log in logs if log.get("event_type") == "fault")
-        healing_count = sum(1 for log in logs if log.get("event_type") == "healing")
-        
         with col1:
-            st.metric("Total Logs", len(logs))
+            st.metric("Matching Logs" if log_cache is not None else "Loaded Logs", view["total"])
         with col2:
-            st.metric("Decisions", decision_count)
+            st.metric("Decisions", counts.get("decision", 0))
         with col3:
-            st.metric("Faults", fault_count)
+            st.metric("Faults", counts.get("fault", 0))
         with col4:
-            st.metric("Healing", healing_count)
+            st.metric("Healing", counts.get("healing", 0))
+        
+        chain = chain_verifier.chain_status()
+        chain_text = (f"Chain integrity: {integrity_badge(chain['status'])} - "
+                      f"{chain['verified']} of {chain['total']} entries linked to genesis")
+        if chain["tip"]:
+            chain_text += f", last verified entry at {format_timestamp(chain['tip'])} UTC"
+        st.markdown(chain_text)
         
         st.markdown("---")
         
-        # Display logs as expandable cards
+        # Display logs as expandable cards - only the visible page is built
         st.subheader("Transaction Log Entries")
         
-        for idx, log in enumerate(logs):
-            event_type = log.get("event_type", "unknown")
-            timestamp = format_timestamp(log.get("timestamp", ""))
-            device_id = log.get("device_id", "N/A")
-            tx_hash = log.get("hash", "N/A")
-            data = log.get("data", {})
+        page_start, page_end = paginate(view["total"], page_size, key="log_page", has_more=view["has_more"])
+        
+        page_logs, page_rows = view["rows"](page_start, page_end)
+        chain_verifier.verify(page_logs)
+        for idx, event_type, timestamp, device_id, tx_hash, data in zip(
+            range(page_start, page_end), page_rows["event_type"], page_rows["time_label"],
+            page_rows["device_id"], page_rows["hash"], page_rows["data"]
+        ):
             
             with st.expander(f"{event_type.upper()} - {timestamp} - Device: {device_id}", expanded=(idx < 3)):
                 col1, col2 = st.columns([1, 2])
@@ -114,31 +248,23 @@ try:
                 with col1:
                     st.markdown(f"""
                     **Event Type:** {event_type}  
-                    **Timestamp:** {timestamp}  
+                    **Timestamp:** {timestamp} UTC  
                     **Device ID:** `{device_id}`  
-                    **TX Hash:** `{tx_hash[:16]}...`
+                    **TX Hash:** `{tx_hash[:16]}...`  
+                    **Integrity:** {integrity_badge(chain_verifier.status(tx_hash))}
                     """)
                 
                 with col2:
-                    st.markdown("**Event Data:**")
-                    st.json(data)
+                    # The JSON tree is only built for entries the user opens
+                    if st.toggle("Show Event Data", key=f"log_data_{idx}_{tx_hash}", value=(idx < 3)):
+                        st.json(data or {})
         
         st.markdown("---")
         
         # Optional: Display as table
         if st.checkbox("Show as Table"):
-            df_logs = pd.DataFrame(logs)
-            
-            # Format timestamp column if exists
-            if 'timestamp' in df_logs.columns:
-                df_logs['timestamp'] = df_logs['timestamp'].apply(format_timestamp)
-            
-            # Display selected columns
-            display_columns = ['event_type', 'timestamp', 'device_id', 'hash']
-            available_columns = [col for col in display_columns if col in df_logs.columns]
-            
             st.dataframe(
-                df_logs[available_columns],
+                page_rows[["event_type", "time_label", "device_id", "hash"]].rename(columns={"time_label": "timestamp (UTC)"}),
                 use_container_width=True,
                 hide_index=True
             )
@@ -151,6 +277,6 @@ except Exception as e:
 st.markdown("---")
 st.markdown("""
     <div style="text-align: center; color: #666; font-size: 14px; padding: 20px;">
-        Blockchain logs are immutable and cryptographically verified
+        Log hashes and chain links are recomputed and verified locally
     </div>
 """, unsafe_allow_html=True)
@@ -0,0 +1,119 @@
+"""
+Fleet Overview Page
+Every device at a glance: latest PM2.5/CO2, AQI color and a PM2.5 sparkline
+"""
+import streamlit as st
+
+from services.data_service import data_service
+from services.fleet_service import fleet_service
+from components.fleet import fleet_grid
+from components.alerts import error_alert, info_alert
+from utils.constants import FLEET_FIRST_WAIT, FLEET_FRAGMENT_INTERVAL, AQI_CATEGORIES
+
+# Page config
+st.set_page_config(page_title="Fleet Overview - VAYU AI", layout="wide")
+
+# Custom CSS for black theme and hiding sidebar
+st.markdown("""
+    <style>
+    .stApp { background-color: #000000 !important; }
+    header {visibility: hidden;}
+    footer {visibility: hidden;}
+    [data-testid="stSidebar"] { display: none; }
+    h1, h2, h3 { color: #FFFFFF !important; }
+
+    /* Gradient styling for all buttons on this page */
+    div[data-testid="stButton"] button {
+        background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%) !important;
+        color: white !important;
+        border: none !important;
+        border-radius: 8px !important;
+        transition: all 0.3s ease !important;
+    }
+
+    div[data-testid="stButton"] button:hover {
+        transform: translateY(-2px) !important;
+        box-shadow: 0 4px 12px rgba(76, 175, 80, 0.3) !important;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+# Top Navigation
+from utils.navigation import render_top_nav
+render_top_nav()
+
+# Header
+st.title("Fleet Overview")
+st.markdown("<p style='color: #AAAAAA;'>Latest air quality of every registered device</p>", unsafe_allow_html=True)
+
+# Controls Row
+col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+with col1:
+    search = st.text_input("Search Device", placeholder="e.g. ESP32_01")
+
+with col2:
+    show = st.selectbox("Show", ["All devices", "Unhealthy for Sensitive or worse", "Backend errors"])
+
+with col3:
+    sort_by = st.selectbox("Sort By", ["Worst AQI first", "Device ID"])
+
+with col4:
+    st.markdown("<br>", unsafe_allow_html=True)
+    auto_refresh = st.checkbox("Auto-refresh", value=True)
+
+st.markdown("---")
+
+try:
+    devices = data_service.get_devices()
+except Exception as e:
+    devices = []
+    error_alert(f"Failed to load device list: {str(e)}")
+
+# The first visit waits briefly for the first batch; afterwards tiles fill in
+# as each batch of the shared refresh pass arrives
+if devices:
+    first_visit = all(tile is None for tile in fleet_service.tiles(devices[:1]).values())
+    fleet_service.refresh(devices, wait=FLEET_FIRST_WAIT if first_visit else 0)
+
+
+def visible_tiles(tiles: dict) -> dict:
+    """Tiles after the search/show filters, in the selected order"""
+    unhealthy_from = AQI_CATEGORIES[1][0]  # above "Moderate"
+    items = [(d, t) for d, t in tiles.items() if search.lower() in d.lower()]
+    if show == "Unhealthy for Sensitive or worse":
+        items = [(d, t) for d, t in items if t and (t.get("aqi") or 0) > unhealthy_from]
+    elif show == "Backend errors":
+        items = [(d, t) for d, t in items if t and t.get("error")]
+    if sort_by == "Worst AQI first":
+        items.sort(key=lambda item: -((item[1] or {}).get("aqi") or -1))
+    return dict(items)
+
+
+@st.fragment(run_every=FLEET_FRAGMENT_INTERVAL if auto_refresh else None)
+def render_fleet_section():
+    """Summary counts and the device tile grid"""
+    fleet_service.refresh(devices)
+    tiles = fleet_service.tiles(devices)
+
+    loaded = [t for t in tiles.values() if t and "reading" in t]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Devices", len(devices))
+    with col2:
+        st.metric("Reporting", len(loaded))
+    with col3:
+        st.metric("AQI > 100", sum(1 for t in loaded if (t.get("aqi") or 0) > AQI_CATEGORIES[1][0]))
+    with col4:
+        st.metric("Backend Errors", sum(1 for t in tiles.values() if t and t.get("error")))
+
+    shown = visible_tiles(tiles)
+    if shown:
+        fleet_grid(shown)
+    else:
+        info_alert("No devices match the current filters")
+
+
+if devices:
+    render_fleet_section()
+else:
+    info_alert("No registered devices found")
@@ -4,72 +4,523 @@ Handles all HTTP requests to the backend API
 """
 import requests
 import os
-from typing import Optional, Dict, List, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Optional, Dict, List, Any, Tuple, Callable, Iterable, Iterator
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.constants import (
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUSES,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, ENDPOINT_TIMEOUTS,
+    AGGREGATION_DEADLINE, FAN_OUT_WORKERS, CAPABILITY_TTL, UNSUPPORTED_STATUSES,
+    API_ROUTES, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT, LAST_KNOWN_MAX_ENTRIES,
+    BATCH_MAX_DEVICES, BATCH_FALLBACK_CONCURRENCY
+)
+from services.instrumentation import metrics
 
 # Load environment variables
 load_dotenv()
 
+# One pooled session per backend URL, shared by every client in the process
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# Learned endpoint support, one registry per backend URL
+_capabilities: Dict[str, "EndpointCapabilities"] = {}
+
+# Per-endpoint circuit breakers, one set per backend URL
+_breakers: Dict[str, Dict[str, "CircuitBreaker"]] = {}
+
+# GET requests currently on the wire, keyed by (base URL, endpoint, params)
+_in_flight: Dict[Tuple, "InFlightCall"] = {}
+_in_flight_lock = threading.Lock()
+
+# Absolute monotonic deadline of the current latency budget, if any
+_budget_deadline: ContextVar[Optional[float]] = ContextVar("vayu_budget_deadline", default=None)
+
+# Shared worker pool for concurrent sub-requests (fan-out aggregation)
+_executor = ThreadPoolExecutor(max_workers=FAN_OUT_WORKERS, thread_name_prefix="vayu-api")
+
+
+class BudgetRetry(Retry):
+    """
+    Retry policy bounded by the caller's latency budget
+    Retries stop once the budget could not cover the next backoff, and
+    Retry-After waits are cut to what is left of it.
+    """
+    
+    def is_exhausted(self) -> bool:
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= self.get_backoff_time():
+            return True
+        return super().is_exhausted()
+    
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        remaining = remaining_budget()
+        if retry_after is None or remaining is None:
+            return retry_after
+        return max(min(retry_after, remaining), 0.0)
+
+
+def _build_session(pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+    """Create a keep-alive session with a bounded connection pool and GET-only retries"""
+    retry = BudgetRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def get_session(base_url: str) -> requests.Session:
+    """Get (or lazily create) the shared session for a backend URL"""
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = _build_session(
+                pool_size=int(os.getenv("HTTP_POOL_SIZE", HTTP_POOL_SIZE)),
+                max_retries=int(os.getenv("HTTP_MAX_RETRIES", HTTP_MAX_RETRIES)),
+                backoff_factor=float(os.getenv("HTTP_BACKOFF_FACTOR", HTTP_BACKOFF_FACTOR))
+            )
+            _sessions[base_url] = session
+        return session
+
+
+class APIError(Exception):
+    """Backend request failure, carrying the HTTP status when there was a response"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class EndpointUnsupportedError(APIError):
+    """Raised without a network call when a route is cached as unimplemented"""
+
+
+class CircuitOpenError(APIError):
+    """Raised without a network call while an endpoint's circuit breaker is open"""
+
+
+class BudgetExceededError(APIError):
+    """Raised without a network call once the caller's latency budget is spent"""
+
+
+class EndpointCapabilities:
+    """
+    Negative cache of routes the backend does not implement
+    Entries expire after ttl seconds so the route is re-probed periodically
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._unsupported_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def is_supported(self, route: str) -> bool:
+        """False while the route is cached as unsupported"""
+        with self._lock:
+            until = self._unsupported_until.get(route)
+            if until is None:
+                return True
+            if time.monotonic() >= until:
+                # TTL expired - allow one re-probe
+                del self._unsupported_until[route]
+                return True
+            return False
+    
+    def mark_unsupported(self, route: str):
+        """Cache a route as unimplemented for ttl seconds"""
+        with self._lock:
+            self._unsupported_until[route] = time.monotonic() + self.ttl
+
+
+def get_capabilities(base_url: str) -> EndpointCapabilities:
+    """Get (or lazily create) the shared capability cache for a backend URL"""
+    with _sessions_lock:
+        capabilities = _capabilities.get(base_url)
+        if capabilities is None:
+            capabilities = EndpointCapabilities(ttl=float(os.getenv("CAPABILITY_TTL", CAPABILITY_TTL)))
+            _capabilities[base_url] = capabilities
+        return capabilities
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one endpoint
+    Opens after failure_threshold consecutive failures, rejects calls for
+    reset_timeout seconds, then lets a single trial call through (half-open)
+    whose outcome closes or re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+    
+    def release(self):
+        """Give back a half-open trial slot whose call ended without an outcome"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def get_breaker(base_url: str, route: str) -> CircuitBreaker:
+    """Get (or lazily create) the shared circuit breaker for a backend route"""
+    with _sessions_lock:
+        breakers = _breakers.setdefault(base_url, {})
+        breaker = breakers.get(route)
+        if breaker is None:
+            breaker = breakers[route] = CircuitBreaker(
+                failure_threshold=int(os.getenv("BREAKER_FAILURE_THRESHOLD", BREAKER_FAILURE_THRESHOLD)),
+                reset_timeout=float(os.getenv("BREAKER_RESET_TIMEOUT", BREAKER_RESET_TIMEOUT))
+            )
+        return breaker
+
+
+def route_for(endpoint: str) -> str:
+    """Map a concrete endpoint (with device IDs) to its route template prefix"""
+    best = None
+    for route in API_ROUTES:
+        if endpoint.startswith(route) and (best is None or len(route) > len(best)):
+            best = route
+    return best or endpoint
+
+
+@contextmanager
+def latency_budget(seconds: float):
+    """
+    Share one deadline across every backend call made inside the block
+    Nested budgets can only shorten the deadline, never extend it
+    """
+    deadline = time.monotonic() + seconds
+    outer = _budget_deadline.get()
+    token = _budget_deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _budget_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current latency budget (None when unbounded)"""
+    deadline = _budget_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def resolve_timeout(endpoint: str, endpoint_timeouts: Dict[str, Tuple[float, float]],
+                    default: Tuple[float, float]) -> Tuple[float, float]:
+    """Resolve (connect, read) timeout by longest matching endpoint prefix"""
+    best = None
+    for prefix in endpoint_timeouts:
+        if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return endpoint_timeouts[best] if best else default
+
+
+class InFlightCall:
+    """Outcome of one in-flight request, shared with the callers that joined it"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def single_flight(key: Tuple, fn: Callable[[], Any], route: str) -> Any:
+    """
+    Run fn once for concurrent callers with the same key
+    The first caller issues the request; callers arriving while it is in
+    flight wait for and share its result (or exception). A waiting caller
+    gives up with BudgetExceededError when its own latency budget runs out.
+    """
+    with _in_flight_lock:
+        call = _in_flight.get(key)
+        leader = call is None
+        if leader:
+            call = _in_flight[key] = InFlightCall()
+    
+    if leader:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with _in_flight_lock:
+                _in_flight.pop(key, None)
+            call.done.set()
+    
+    metrics.count_coalesced(route)
+    remaining = remaining_budget()
+    if not call.done.wait(None if remaining is None else max(remaining, 0)):
+        raise BudgetExceededError(f"API Error: latency budget exhausted waiting for {route}")
+    if call.error is not None:
+        raise call.error
+    return call.result
+
+
+def _error_kind(error: requests.exceptions.RequestException) -> str:
+    """Metrics label for a failed request"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection"
+    if isinstance(error, requests.exceptions.HTTPError):
+        return "http_status"
+    if isinstance(error, ValueError):
+        return "decode"
+    return "other"
+
 
 class VayuAPIClient:
     """Client for interacting with VAYU AI backend API"""
     
-    def __init__(self):
-        self.base_url = os.getenv("BACKEND_URL", "http://localhost:8000")
-        self.timeout = 10  # seconds
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or os.getenv("BACKEND_URL", "http://localhost:8000")
+        self.timeout = (
+            float(os.getenv("HTTP_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT)),
+            float(os.getenv("HTTP_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+        )  # (connect, read) seconds
+        self.endpoint_timeouts = dict(ENDPOINT_TIMEOUTS)
+        self.session = get_session(self.base_url)
+        self.capabilities = get_capabilities(self.base_url)
+        # Last successful GET response per (endpoint, params), served while a breaker is open
+        self._last_known: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._last_known_lock = threading.Lock()
+    
+    def _timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Resolve (connect, read) timeout for an endpoint, clamped to the latency budget"""
+        connect, read = resolve_timeout(endpoint, self.endpoint_timeouts, self.timeout)
+        remaining = remaining_budget()
+        if remaining is None:
+            return connect, read
+        remaining = max(remaining, 0.01)
+        return min(connect, remaining), min(read, remaining)
+    
+    def _remember(self, key: Tuple, payload: Dict[str, Any]):
+        with self._last_known_lock:
+            self._last_known[key] = payload
+            self._last_known.move_to_end(key)
+            while len(self._last_known) > LAST_KNOWN_MAX_ENTRIES:
+                self._last_known.popitem(last=False)
+    
+    def _recall(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._last_known_lock:
+            return self._last_known.get(key)
+    
+    def breaker_states(self) -> Dict[str, str]:
+        """State of every endpoint breaker on this backend that is not closed"""
+        with _sessions_lock:
+            breakers = dict(_breakers.get(self.base_url, {}))
+        return {route: b.state for route, b in breakers.items() if b.state != CircuitBreaker.CLOSED}
+    
+    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                 data: Optional[Dict] = None) -> Dict[str, Any]:
+        """Send one request through the endpoint's circuit breaker and the latency budget"""
+        route = route_for(endpoint)
+        # The budget is checked first: allow() may hand out the half-open trial slot
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            metrics.count_error(method, route, "budget_exhausted")
+            raise BudgetExceededError(f"API Error: latency budget exhausted before {route}")
+        breaker = get_breaker(self.base_url, route)
+        if not breaker.allow():
+            metrics.count_error(method, route, "circuit_open")
+            raise CircuitOpenError(f"API Error: circuit open for {route}")
         
-    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make GET request to API"""
         url = f"{self.base_url}{endpoint}"
+        response = None
+        started = time.perf_counter()
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.request(method, url, params=params, json=data, timeout=self._timeout_for(endpoint))
+            metrics.observe_request(method, route, response.status_code, time.perf_counter() - started,
+                                    len(response.content))
             response.raise_for_status()
-            return response.json()
+            decode_started = time.perf_counter()
+            payload = response.json()
+            metrics.observe_decode(route, time.perf_counter() - decode_started)
         except requests.exceptions.RequestException as e:
-            raise Exception(f"API Error: {str(e)}")
+            if response is None:
+                metrics.observe_request(method, route, None, time.perf_counter() - started, 0)
+            metrics.count_error(method, route, _error_kind(e))
+            status_code = e.response.status_code if e.response is not None else None
+            # Only unavailability trips the breaker; client errors and 501 do not
+            if status_code is None or (status_code >= 500 and status_code not in UNSUPPORTED_STATUSES):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise APIError(f"API Error: {str(e)}", status_code)
+        except BaseException:
+            # Left without an outcome (e.g. interrupted): free the trial slot
+            breaker.release()
+            raise
+        breaker.record_success()
+        return payload
+        
+    def _get(self, endpoint: str, params: Optional[Dict] = None, route: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Make GET request to API
+        When route is given, its support is learned: 404/405/501 responses are
+        cached and later calls fail fast with EndpointUnsupportedError (only
+        405/501 when the endpoint adds path parameters to the route).
+        While the endpoint's breaker is open or the budget is spent, the last
+        known response for the same request is returned instead, if there is one.
+        Identical GETs already in flight are joined instead of sent again.
+        """
+        if route and not self.capabilities.is_supported(route):
+            raise EndpointUnsupportedError(f"API Error: {route} is not implemented by backend (cached)", 501)
+        
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        try:
+            payload = single_flight((self.base_url,) + key,
+                                    lambda: self._request("GET", endpoint, params=params),
+                                    route_for(endpoint))
+        except (CircuitOpenError, BudgetExceededError):
+            stale = self._recall(key)
+            if stale is None:
+                raise
+            return stale
+        except APIError as e:
+            # A 404 under a route with a path parameter (e.g. an unknown device)
+            # is about that resource, not the route
+            if route and e.status_code in UNSUPPORTED_STATUSES and (endpoint == route or e.status_code != 404):
+                self.capabilities.mark_unsupported(route)
+            raise
+        self._remember(key, payload)
+        return payload
     
     def _post(self, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make POST request to API"""
-        url = f"{self.base_url}{endpoint}"
-        try:
-            response = requests.post(url, json=data, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API Error: {str(e)}")
+        """Make POST request to API (never coalesced)"""
+        return self._request("POST", endpoint, params=params, data=data)
     
     def _delete(self, endpoint: str) -> Dict[str, Any]:
-        """Make DELETE request to API"""
-        url = f"{self.base_url}{endpoint}"
-        try:
-            response = requests.delete(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API Error: {str(e)}")
+        """Make DELETE request to API (never coalesced)"""
+        return self._request("DELETE", endpoint)
     
     # Health Check
     def health_check(self) -> Dict[str, Any]:
-        """Check backend health status"""
-        return self._get("/health")
+        """Check backend health status (never answered from last known data)"""
+        return self._request("GET", "/health")
     
     # Dashboard Endpoints
     def get_dashboard_data(self, device_id: str) -> Dict[str, Any]:
         """
         Get comprehensive dashboard data for a device
-        Note: This endpoint may return 501 if not implemented
+        Note: This endpoint may return 501 if not implemented; that result is
+        cached per backend for CAPABILITY_TTL seconds
         """
-        return self._get(f"/api/v1/dashboard/data/{device_id}")
+        return self._get(f"/api/v1/dashboard/data/{device_id}", route="/api/v1/dashboard/data")
     
     def get_devices(self) -> List[str]:
         """Get list of all registered devices"""
         response = self._get("/api/v1/dashboard/devices")
         return response.get("devices", [])
     
-    def get_blockchain_logs(self, limit: int = 20) -> List[Dict]:
-        """Get recent blockchain logs"""
-        response = self._get("/api/v1/dashboard/blockchain/logs", params={"limit": limit})
-        return response.get("logs", [])
+    def get_blockchain_logs(self, limit: int = 20, event_types: Optional[Iterable[str]] = None,
+                            device_id: Optional[str] = None, since: Optional[str] = None,
+                            until: Optional[str] = None) -> List[Dict]:
+        """Get recent blockchain logs, filtered by the backend"""
+        return self.get_blockchain_log_page(limit, event_types, device_id, since, until)["logs"]
+    
+    def get_blockchain_log_page(self, limit: int = 20, event_types: Optional[Iterable[str]] = None,
+                                device_id: Optional[str] = None, since: Optional[str] = None,
+                                until: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of blockchain logs, newest first
+        Filters are pushed down as query params (`event_type` comma-separated,
+        `since`/`until` ISO timestamps); `cursor` is the previous page's
+        `next_cursor`. Returns {"logs": [...], "next_cursor": str or None}.
+        Logs are re-checked against the filters in case the backend ignores them.
+        """
+        event_types = sorted(event_types) if event_types else None
+        params = {"limit": limit}
+        if event_types:
+            params["event_type"] = ",".join(event_types)
+        if device_id:
+            params["device_id"] = device_id
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        if cursor:
+            params["cursor"] = cursor
+        response = self._get("/api/v1/dashboard/blockchain/logs", params=params)
+        
+        logs = response.get("logs", [])
+        if event_types:
+            logs = [log for log in logs if log.get("event_type") in event_types]
+        if device_id:
+            logs = [log for log in logs if log.get("device_id") == device_id]
+        return {"logs": logs, "next_cursor": response.get("next_cursor")}
+    
+    def iter_blockchain_logs(self, page_size: int = 20, event_types: Optional[Iterable[str]] = None,
+                             device_id: Optional[str] = None, since: Optional[str] = None,
+                             until: Optional[str] = None, cursor: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Yield pages of blockchain logs, newest first, fetching each page only
+        when the consumer asks for it. Stops when the backend returns no
+        `next_cursor` (backends without cursor support yield a single page).
+        """
+        while True:
+            page = self.get_blockchain_log_page(page_size, event_types, device_id, since, until, cursor)
+            yield page["logs"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
     
     def get_analytics(self, device_id: str, hours: int = 24) -> Dict[str, Any]:
         """Get analytics for a device"""
@@ -80,9 +531,19 @@ class VayuAPIClient:
         """Get current sensor status"""
         return self._get(f"/api/v1/sensor/status/{device_id}")
     
-    def get_sensor_history(self, device_id: str, limit: int = 50) -> List[Dict]:
-        """Get historical sensor readings"""
-        response = self._get(f"/api/v1/sensor/history/{device_id}", params={"limit": limit})
+    def get_sensor_history(self, device_id: str, limit: int = 50, since: Optional[str] = None,
+                           until: Optional[str] = None) -> List[Dict]:
+        """
+        Get historical sensor readings (the newest `limit` in the range)
+        `since` / `until` (ISO timestamps) ask the backend for readings newer /
+        older than them only
+        """
+        params = {"limit": limit}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        response = self._get(f"/api/v1/sensor/history/{device_id}", params=params)
         return response.get("readings", [])
     
     # Control Endpoints
@@ -105,43 +566,154 @@ class VayuAPIClient:
         """Clear manual override and return to automatic control"""
         return self._delete(f"/api/v1/control/override/{device_id}")
     
+    # Multi-device Endpoints
+    def get_many_sensor_status(self, device_ids: Iterable[str], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get current sensor status for many devices
+        Returns {device_id: status or APIError}
+        """
+        return self._get_many(device_ids, "/api/v1/sensor/status/batch", self.get_sensor_status,
+                              max_concurrency=max_concurrency)
+    
+    def get_many_sensor_history(self, device_ids: Iterable[str], limit: int = 50,
+                                max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get historical sensor readings for many devices
+        Returns {device_id: readings or APIError}
+        """
+        return self._get_many(device_ids, "/api/v1/sensor/history/batch",
+                              lambda device_id: self.get_sensor_history(device_id, limit=limit),
+                              params={"limit": limit}, max_concurrency=max_concurrency)
+    
+    def get_many_control_status(self, device_ids: Iterable[str], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get current control status for many devices
+        Returns {device_id: status or APIError}
+        """
+        return self._get_many(device_ids, "/api/v1/control/status/batch", self.get_control_status,
+                              max_concurrency=max_concurrency)
+    
+    def _get_many(self, device_ids: Iterable[str], batch_route: str, fetch_one: Callable[[str], Any],
+                  params: Optional[Dict] = None, max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Query many devices through the batch endpoint when the backend has one,
+        otherwise through a bounded parallel loop of single-device calls.
+        A failure for one device (or one batch chunk) never hides the others.
+        """
+        device_ids = list(dict.fromkeys(device_ids))
+        results: Dict[str, Any] = {}
+        pending = device_ids
+        
+        if self.capabilities.is_supported(batch_route):
+            pending = []
+            for start in range(0, len(device_ids), BATCH_MAX_DEVICES):
+                chunk = device_ids[start:start + BATCH_MAX_DEVICES]
+                try:
+                    response = self._get(batch_route, params={**(params or {}), "device_ids": ",".join(chunk)},
+                                         route=batch_route)
+                except EndpointUnsupportedError:
+                    pending.extend(chunk)
+                    continue
+                except APIError as e:
+                    if e.status_code in UNSUPPORTED_STATUSES:
+                        pending.extend(chunk)
+                    else:
+                        results.update({device_id: e for device_id in chunk})
+                    continue
+                if "results" not in response:
+                    # A route like /history/{device_id} answered for device "batch"
+                    self.capabilities.mark_unsupported(batch_route)
+                    pending.extend(device_ids[start:])
+                    break
+                batch_results = response["results"]
+                for device_id in chunk:
+                    if device_id in batch_results:
+                        results[device_id] = batch_results[device_id]
+                    else:
+                        results[device_id] = APIError(f"API Error: no result for {device_id} in batch response", 404)
+        
+        if pending:
+            workers = min(max_concurrency or BATCH_FALLBACK_CONCURRENCY, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vayu-batch") as pool:
+                # copy_context carries the caller's latency budget into the worker threads
+                futures = {pool.submit(copy_context().run, fetch_one, device_id): device_id for device_id in pending}
+                for future, device_id in futures.items():
+                    try:
+                        results[device_id] = future.result()
+                    except Exception as e:
+                        results[device_id] = e if isinstance(e, APIError) else APIError(str(e))
+        
+        return {device_id: results[device_id] for device_id in device_ids}
+    
     # Aggregated data method (fallback if dashboard endpoint not ready)
-    def get_aggregated_dashboard_data(self, device_id: str) -> Dict[str, Any]:
+    def get_aggregated_dashboard_data(self, device_id: str, deadline: Optional[float] = None,
+                                      include_reading: bool = True) -> Dict[str, Any]:
         """
         Aggregate data from multiple endpoints
         Fallback method if /api/v1/dashboard/data is not implemented
+        
+        The fallback sub-requests are issued concurrently and bounded by a
+        total deadline; any that fail or miss it are reported in
+        system_health["errors"] while the rest of the payload is still returned.
+        Pass include_reading=False when the caller tracks the latest reading itself
+        (e.g. from a SensorHistoryBuffer) to skip the history sub-request.
         """
         try:
-            # Try the main dashboard endpoint first
+            # Try the main dashboard endpoint first (fails fast once known unsupported)
             return self.get_dashboard_data(device_id)
         except Exception as e:
             # If it fails (501 or other error), aggregate manually
+            return self._fan_out_dashboard_data(device_id, deadline or AGGREGATION_DEADLINE, include_reading)
+    
+    def _fan_out_dashboard_data(self, device_id: str, deadline: float, include_reading: bool = True) -> Dict[str, Any]:
+        """Fetch the fallback sub-resources in parallel within a total deadline"""
+        calls = {
+            "control_status": lambda: self.get_control_status(device_id),
+            "recent_logs": lambda: self.get_blockchain_logs(limit=10),
+        }
+        if include_reading:
+            # Sensor history (most recent reading)
+            calls["current_reading"] = lambda: next(iter(self.get_sensor_history(device_id, limit=1)), None)
+        defaults = {"current_reading": None, "control_status": None, "recent_logs": []}
+        
+        # Each sub-call runs under the fan-out deadline (nested in the caller's
+        # budget, carried over by copy_context), so calls still running when
+        # wait() gives up end themselves instead of holding _executor workers
+        ends_at = time.monotonic() + deadline
+
+        def bounded(fn):
+            with latency_budget(max(ends_at - time.monotonic(), 0.0)):
+                return fn()
+
+        futures = {_executor.submit(copy_context().run, bounded, fn): key for key, fn in calls.items()}
+        done, not_done = wait(futures, timeout=deadline)
+        
+        results = dict(defaults)
+        errors = {}
+        for future in done:
+            key = futures[future]
             try:
-                # Get sensor history (most recent reading)
-                history = self.get_sensor_history(device_id, limit=1)
-                current_reading = history[0] if history else None
-                
-                # Get control status
-                control_status = self.get_control_status(device_id)
-                
-                # Get blockchain logs
-                logs = self.get_blockchain_logs(limit=10)
-                
-                # Construct aggregated response
-                # Note: prediction, classification, and faults won't be available
-                # unless backend implements those endpoints separately
-                return {
-                    "current_reading": current_reading,
-                    "control_status": control_status,
-                    "recent_logs": logs,
-                    "system_health": {"status": "partial_data"},
-                    # These will be None if not available
-                    "prediction": None,
-                    "classification": None,
-                    "recent_faults": []
-                }
-            except Exception as agg_error:
-                raise Exception(f"Failed to aggregate data: {str(agg_error)}")
+                results[key] = future.result()
+            except Exception as sub_error:
+                errors[key] = str(sub_error)
+        for future in not_done:
+            future.cancel()
+            errors[futures[future]] = f"Timed out after {deadline:.1f}s"
+        
+        if len(errors) == len(calls):
+            raise APIError(f"Failed to aggregate data: {'; '.join(errors.values())}")
+        
+        # Construct aggregated response
+        # Note: prediction, classification, and faults won't be available
+        # unless backend implements those endpoints separately
+        return {
+            **results,
+            "system_health": {"status": "partial_data", "errors": errors},
+            # These will be None if not available
+            "prediction": None,
+            "classification": None,
+            "recent_faults": []
+        }
 
 
 # Global API client instance
@@ -0,0 +1,223 @@
+"""
+Async API Client for VAYU AI Backend
+Asyncio-native mirror of VayuAPIClient for overlapping many requests
+"""
+import asyncio
+import os
+import threading
+from typing import Optional, Dict, List, Any, Awaitable, Iterable
+
+import aiohttp
+from dotenv import load_dotenv
+
+from services.api_client import APIError, resolve_timeout
+from utils.constants import (
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUSES,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, ENDPOINT_TIMEOUTS, ASYNC_MAX_CONCURRENCY
+)
+
+# Load environment variables
+load_dotenv()
+
+
+class _LoopThread:
+    """Background thread owning the shared event loop"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._loop.run_forever, name="vayu-async-loop", daemon=True)
+                thread.start()
+            return self._loop
+
+
+_shared_loop = _LoopThread()
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared event loop and block for its result
+    Lets synchronous code (Streamlit scripts) call AsyncVayuAPIClient
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _shared_loop.loop)
+    return future.result(timeout)
+
+
+def _encode_params(params: Optional[Dict]) -> Optional[Dict[str, str]]:
+    """aiohttp only accepts str/int/float query values, so encode booleans like requests does"""
+    if not params:
+        return params
+    return {key: str(value).lower() if isinstance(value, bool) else value for key, value in params.items()}
+
+
+class AsyncVayuAPIClient:
+    """Asyncio client for interacting with VAYU AI backend API"""
+
+    def __init__(self, base_url: Optional[str] = None, max_concurrency: Optional[int] = None):
+        self.base_url = base_url or os.getenv("BACKEND_URL", "http://localhost:8000")
+        self.timeout = (
+            float(os.getenv("HTTP_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT)),
+            float(os.getenv("HTTP_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+        )  # (connect, read) seconds
+        self.endpoint_timeouts = dict(ENDPOINT_TIMEOUTS)
+        self.pool_size = int(os.getenv("HTTP_POOL_SIZE", HTTP_POOL_SIZE))
+        self.max_retries = int(os.getenv("HTTP_MAX_RETRIES", HTTP_MAX_RETRIES))
+        self.backoff_factor = float(os.getenv("HTTP_BACKOFF_FACTOR", HTTP_BACKOFF_FACTOR))
+        self.max_concurrency = max_concurrency or int(os.getenv("ASYNC_MAX_CONCURRENCY", ASYNC_MAX_CONCURRENCY))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the pooled session on the running loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector, raise_for_status=True)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _timeout_for(self, endpoint: str) -> aiohttp.ClientTimeout:
+        """Resolve (connect, read) timeout for an endpoint"""
+        connect, read = resolve_timeout(endpoint, self.endpoint_timeouts, self.timeout)
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    async def _request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                       params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make request to API, retrying idempotent GETs with backoff"""
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+        attempts = self.max_retries + 1 if method == "GET" else 1
+
+        for attempt in range(attempts):
+            try:
+                async with self._semaphore:
+                    async with session.request(method, url, json=data, params=_encode_params(params),
+                                               timeout=self._timeout_for(endpoint)) as response:
+                        return await response.json()
+            except (aiohttp.ContentTypeError, ValueError) as e:
+                # A 2xx body that is not JSON: a decode error, like requests' JSONDecodeError
+                raise APIError(f"API Error: invalid JSON response ({getattr(e, 'message', None) or e})")
+            except aiohttp.ClientResponseError as e:
+                if attempt + 1 >= attempts or e.status not in HTTP_RETRY_STATUSES:
+                    raise APIError(f"API Error: {str(e)}", e.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt + 1 >= attempts:
+                    raise APIError(f"API Error: {str(e) or type(e).__name__}")
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make GET request to API"""
+        return await self._request("GET", endpoint, params=params)
+
+    async def _post(self, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make POST request to API"""
+        return await self._request("POST", endpoint, data=data, params=params)
+
+    async def _delete(self, endpoint: str) -> Dict[str, Any]:
+        """Make DELETE request to API"""
+        return await self._request("DELETE", endpoint)
+
+    # Health Check
+    async def health_check(self) -> Dict[str, Any]:
+        """Check backend health status"""
+        return await self._get("/health")
+
+    # Dashboard Endpoints
+    async def get_dashboard_data(self, device_id: str) -> Dict[str, Any]:
+        """Get comprehensive dashboard data for a device"""
+        return await self._get(f"/api/v1/dashboard/data/{device_id}")
+
+    async def get_devices(self) -> List[str]:
+        """Get list of all registered devices"""
+        response = await self._get("/api/v1/dashboard/devices")
+        return response.get("devices", [])
+
+    async def get_blockchain_logs(self, limit: int = 20, event_types: Optional[Iterable[str]] = None,
+                                  device_id: Optional[str] = None, since: Optional[str] = None,
+                                  until: Optional[str] = None) -> List[Dict]:
+        """Get recent blockchain logs, filtered by the backend"""
+        params = {"limit": limit}
+        if event_types:
+            params["event_type"] = ",".join(sorted(event_types))
+        if device_id:
+            params["device_id"] = device_id
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        response = await self._get("/api/v1/dashboard/blockchain/logs", params=params)
+        return response.get("logs", [])
+
+    async def get_analytics(self, device_id: str, hours: int = 24) -> Dict[str, Any]:
+        """Get analytics for a device"""
+        return await self._get(f"/api/v1/dashboard/analytics/{device_id}", params={"hours": hours})
+
+    # Sensor Endpoints
+    async def get_sensor_status(self, device_id: str) -> Dict[str, Any]:
+        """Get current sensor status"""
+        return await self._get(f"/api/v1/sensor/status/{device_id}")
+
+    async def get_sensor_history(self, device_id: str, limit: int = 50, since: Optional[str] = None,
+                                 until: Optional[str] = None) -> List[Dict]:
+        """Get historical sensor readings (the newest `limit` in the since/until range)"""
+        params = {"limit": limit}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        response = await self._get(f"/api/v1/sensor/history/{device_id}", params=params)
+        return response.get("readings", [])
+
+    # Control Endpoints
+    async def get_control_status(self, device_id: str) -> Dict[str, Any]:
+        """Get current control status"""
+        return await self._get(f"/api/v1/control/status/{device_id}")
+
+    async def set_control_override(self, device_id: str, fan_on: bool, fan_intensity: int) -> Dict[str, Any]:
+        """Set manual control override"""
+        return await self._post(
+            "/api/v1/control/override",
+            params={
+                "device_id": device_id,
+                "fan_on": fan_on,
+                "fan_intensity": fan_intensity
+            }
+        )
+
+    async def clear_control_override(self, device_id: str) -> Dict[str, Any]:
+        """Clear manual override and return to automatic control"""
+        return await self._delete(f"/api/v1/control/override/{device_id}")
+
+    # Gather helpers
+    async def gather(self, *calls: Awaitable) -> List[Any]:
+        """
+        Run several endpoint calls concurrently
+        Failed calls are returned as their Exception instead of raising
+        """
+        return list(await asyncio.gather(*calls, return_exceptions=True))
+
+    async def gather_devices(self, device_ids: Iterable[str], method: str, **kwargs) -> Dict[str, Any]:
+        """
+        Call one per-device endpoint method for many devices concurrently
+        Example: await client.gather_devices(ids, "get_sensor_history", limit=1)
+        Returns {device_id: result or Exception}
+        """
+        device_ids = list(device_ids)
+        fn = getattr(self, method)
+        results = await self.gather(*(fn(device_id, **kwargs) for device_id in device_ids))
+        return dict(zip(device_ids, results))
+
+
+# Global async API client instance (bound to the shared event loop via run_async)
+async_api_client = AsyncVayuAPIClient()
@@ -0,0 +1,247 @@
+"""
+Blockchain Chain-Integrity Verifier
+Incrementally recomputes log hashes and checks each entry's link to its predecessor
+"""
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Set
+
+from services.api_client import VayuAPIClient, APIError, api_client, latency_budget
+from services.log_cache import BlockchainLogCache, log_cache
+from utils.reading_store import parse_timestamp_ns
+from utils.constants import (
+    CHAIN_HASH_FIELDS, CHAIN_PREVIOUS_HASH_FIELD, CHAIN_GENESIS_HASHES,
+    CHAIN_VERIFY_WORKERS, CHAIN_PARALLEL_THRESHOLD, CHAIN_SYNC_PAGE_SIZE, PAGE_LATENCY_BUDGET
+)
+
+logger = logging.getLogger(__name__)
+
+# Entry / chain statuses
+VERIFIED = "verified"  # hash recomputes and links back to genesis
+PENDING = "pending"  # hash recomputes, predecessor not seen yet
+TAMPERED = "tampered"  # stored hash does not match, in a chain whose other hashes do
+BROKEN = "broken"  # predecessor missing or tampered after a full backfill
+UNVERIFIABLE = "unverifiable"  # no hash or previous-hash field, or no entry matches the hashing scheme
+
+
+def compute_log_hash(log: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of the entry's hashed fields"""
+    payload = {field: log.get(field) for field in CHAIN_HASH_FIELDS}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _content_checks(logs: List[Dict]) -> List[bool]:
+    return [compute_log_hash(log) == log.get("hash") for log in logs]
+
+
+class ChainVerifier:
+    """
+    Process-wide record of verified blockchain log entries
+
+    Every entry is hashed once: already-seen hashes are skipped, so each
+    refresh only costs the new entries. Links are resolved through a hash
+    index, so entries may arrive in any order (newest-first pages, filtered
+    views); an entry is verified once its chain reaches genesis through
+    untampered entries. With a log cache, `sync` reads the entries the cache
+    has stored since the last call (no backend traffic of its own); without
+    one it pulls the unfiltered chain page by page, resuming from the last
+    verified position. Until the chain has been seen in full, unresolved
+    links are pending rather than broken.
+
+    CHAIN_HASH_FIELDS is an assumed scheme: entries without the linkage field
+    are unverifiable, and hash mismatches only count as tampering once some
+    entry has matched the scheme - until then they are unverifiable too.
+    """
+
+    def __init__(self, client: VayuAPIClient, cache: Optional[BlockchainLogCache] = None,
+                 workers: int = CHAIN_VERIFY_WORKERS):
+        self.client = client
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vayu-chain")
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._valid: Dict[str, bool] = {}  # hash -> content hash matches
+        self._unlinked: Set[str] = set()  # entries without a previous-hash field
+        self._mismatched: Set[str] = set()  # linked entries whose hash does not recompute
+        self._matched = 0  # linked entries whose hash recomputes (confirms the scheme)
+        self._anchored: Set[str] = set()  # entries linked back to genesis
+        self._waiting: Dict[str, List[str]] = {}  # missing predecessor hash -> children
+        self._waiting_timestamps: Dict[str, Optional[str]] = {}
+        self._tip: Optional[tuple] = None  # (timestamp_ns, timestamp) of the newest anchored entry
+        self._pass: Optional[Dict[str, Any]] = None  # sync pass in progress: since + cursor
+        self._backfilled = False
+        self._cache_rowid = 0  # last cache row verified
+        self._sync_thread: Optional[threading.Thread] = None
+
+    # Verification
+    def verify(self, logs: List[Dict]) -> int:
+        """Verify entries not seen before; returns how many were new"""
+        with self._lock:
+            new = [log for log in logs if log.get("hash") and log["hash"] not in self._valid]
+        if not new:
+            return 0
+
+        if len(new) >= CHAIN_PARALLEL_THRESHOLD:
+            chunk = -(-len(new) // self._workers)
+            chunks = [new[i:i + chunk] for i in range(0, len(new), chunk)]
+            checks = [ok for part in self._executor.map(_content_checks, chunks) for ok in part]
+        else:
+            checks = _content_checks(new)
+
+        added = 0
+        with self._lock:
+            for log, ok in zip(new, checks):
+                tx_hash = log["hash"]
+                if tx_hash in self._valid:
+                    continue
+                added += 1
+                self._valid[tx_hash] = ok
+                previous = log.get(CHAIN_PREVIOUS_HASH_FIELD)
+                if previous is None:
+                    self._unlinked.add(tx_hash)
+                elif not ok:
+                    self._mismatched.add(tx_hash)
+                elif previous in CHAIN_GENESIS_HASHES or previous in self._anchored:
+                    self._anchor(tx_hash, log.get("timestamp"))
+                else:
+                    self._waiting.setdefault(previous, []).append(tx_hash)
+                    self._waiting_timestamps[tx_hash] = log.get("timestamp")
+                self._matched += bool(previous is not None and ok)
+        return added
+
+    def _anchor(self, tx_hash: str, timestamp: Optional[str]):
+        """Mark an entry and every valid descendant waiting on it as linked to genesis"""
+        stack = [(tx_hash, timestamp)]
+        while stack:
+            current, ts = stack.pop()
+            self._anchored.add(current)
+            ts_ns = parse_timestamp_ns(ts) if ts else None
+            if ts_ns is not None and (self._tip is None or ts_ns > self._tip[0]):
+                self._tip = (ts_ns, ts)
+            for child in self._waiting.pop(current, []):
+                child_ts = self._waiting_timestamps.pop(child, None)
+                stack.append((child, child_ts))
+
+    # Sync
+    def sync(self, max_pages: Optional[int] = None) -> int:
+        """
+        Verify entries added to the log cache, or pulled from the backend
+        Without a cache, a pass walks newest-first pages since the last
+        verified entry; an interrupted pass (error, latency budget) resumes
+        from its cursor on the next call. Returns the number of new entries;
+        0 if another session is already syncing.
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            return 0
+        try:
+            if self.cache is not None:
+                return self._sync_from_cache(max_pages)
+            added, pages = 0, 0
+            with self._lock:
+                if self._pass is None:
+                    self._pass = {"since": self._tip[1] if self._tip else None, "cursor": None}
+                current = self._pass
+            while max_pages is None or pages < max_pages:
+                page = self.client.get_blockchain_log_page(
+                    CHAIN_SYNC_PAGE_SIZE, since=current["since"], cursor=current["cursor"]
+                )
+                added += self.verify(page["logs"])
+                pages += 1
+                current["cursor"] = page["next_cursor"]
+                if not current["cursor"]:
+                    with self._lock:
+                        self._pass = None
+                        self._backfilled = True
+                    break
+            return added
+        finally:
+            self._sync_lock.release()
+
+    def _sync_from_cache(self, max_pages: Optional[int]) -> int:
+        """Verify cache rows after the last one read (caller holds the sync lock)"""
+        # Read before draining, so rows stored meanwhile are never taken as the full chain
+        complete = self.cache.complete()
+        added, pages = 0, 0
+        while max_pages is None or pages < max_pages:
+            rows = self.cache.entries_after(self._cache_rowid, CHAIN_SYNC_PAGE_SIZE)
+            if not rows:
+                with self._lock:
+                    self._backfilled = complete
+                break
+            added += self.verify([log for _, log in rows])
+            self._cache_rowid = rows[-1][0]
+            pages += 1
+        return added
+
+    def sync_in_background(self):
+        """Start a sync thread unless one is running (pages never wait on it)"""
+        with self._lock:
+            if self._sync_thread is None or not self._sync_thread.is_alive():
+                self._sync_thread = threading.Thread(target=self._sync_worker, name="vayu-chain-sync", daemon=True)
+                self._sync_thread.start()
+
+    def _sync_worker(self):
+        try:
+            with latency_budget(PAGE_LATENCY_BUDGET):
+                self.sync()
+        except APIError:
+            pass  # an interrupted pass resumes on the next call
+        except Exception:
+            # The next sync_in_background call starts a fresh worker
+            logger.exception("Blockchain chain sync failed")
+
+    # Status
+    def status(self, tx_hash: Optional[str]) -> str:
+        """Status of one entry (PENDING if it has not been verified yet)"""
+        with self._lock:
+            if not tx_hash or tx_hash in self._unlinked:
+                return UNVERIFIABLE
+            valid = self._valid.get(tx_hash)
+            if valid is None:
+                return PENDING
+            if not valid:
+                return TAMPERED if self._matched else UNVERIFIABLE
+            if tx_hash in self._anchored:
+                return VERIFIED
+            return BROKEN if self._complete() else PENDING
+
+    def _complete(self) -> bool:
+        """A full pass has finished and none is in progress (caller holds the lock)"""
+        return self._backfilled and self._pass is None
+
+    def chain_status(self) -> Dict[str, Any]:
+        """Whole-chain status plus entry counts"""
+        with self._lock:
+            total = len(self._valid)
+            verified = len(self._anchored)
+            tampered = len(self._mismatched) if self._matched else 0
+            unverifiable = len(self._unlinked) + len(self._mismatched) - tampered
+            unresolved = total - verified - unverifiable - tampered
+            if tampered:
+                status = TAMPERED
+            elif not self._backfilled or (unresolved and not self._complete()):
+                status = PENDING  # a pass in progress only matters while links are unresolved
+            elif unresolved:
+                status = BROKEN
+            elif total and unverifiable == total:
+                status = UNVERIFIABLE
+            else:
+                status = VERIFIED
+            return {
+                "status": status,
+                "total": total,
+                "verified": verified,
+                "tampered": tampered,
+                "unresolved": unresolved,
+                "unverifiable": unverifiable,
+                "tip": self._tip[1] if self._tip else None,
+            }
+
+
+# Global instance (fed from the log cache when it is enabled)
+chain_verifier = ChainVerifier(api_client, cache=log_cache)
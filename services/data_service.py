@@ -0,0 +1,290 @@
+"""
+Shared Dashboard Data Service
+Process-wide poller so all browser sessions watching a device share one
+set of backend requests per refresh interval, with live push updates from
+the backend event stream when it is available
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, List, Any
+from dotenv import load_dotenv
+
+from services.api_client import VayuAPIClient, APIError, api_client, latency_budget
+from services.history_buffer import SensorHistoryBuffer
+from services.stream_client import VayuStreamClient
+from services.timeseries_store import SensorTimeSeriesStore, timeseries_store
+from utils.downsampling import shared_indices, target_points
+from utils.reading_store import ReadingColumns
+from utils.constants import (
+    DEFAULT_REFRESH_INTERVAL, VIEWER_LEASE_INTERVALS, DEVICE_LIST_TTL, HISTORY_CHART_LIMIT,
+    STREAM_RECONCILE_INTERVAL, PAGE_LATENCY_BUDGET, HISTORY_CHART_WIDTH_PX, DOWNSAMPLE_MINMAX_RATIO,
+    SENSOR_FIELDS
+)
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardDataService:
+    """
+    Polls each device that has viewers once per interval and publishes snapshots
+
+    Viewers hold leases that they renew on every script run; a device's
+    poller starts with its first viewer and stops once every lease expired
+    or was released. The live event stream runs while any device has a
+    poller; while it is connected, pushed readings, control changes and
+    logs are applied to snapshots as they arrive; polling keeps its
+    interval for the fields the stream does not carry (AI results, faults)
+    and re-syncs sensor history only every STREAM_RECONCILE_INTERVAL. Every
+    published snapshot carries a version; fragments redraw from the latest
+    snapshot on every tick and Streamlit's element diffing skips repainting
+    unchanged output.
+    """
+
+    def __init__(self, client: VayuAPIClient, interval: Optional[float] = None, lease_ttl: Optional[float] = None,
+                 live_stream: Optional[bool] = None, archive: Optional[SensorTimeSeriesStore] = None):
+        self.client = client
+        self.archive = archive
+        self.interval = interval or float(os.getenv("REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL))
+        self.lease_ttl = lease_ttl or self.interval * VIEWER_LEASE_INTERVALS
+        if live_stream is None:
+            live_stream = os.getenv("LIVE_STREAM", "true").lower() == "true"
+        self.stream = VayuStreamClient(self._on_stream_event, base_url=client.base_url) if live_stream else None
+        # Condition doubles as the state lock and the "snapshot published" signal
+        self._lock = threading.Condition()
+        self._versions: Dict[str, int] = {}
+        self._viewers: Dict[str, Dict[str, float]] = {}  # device_id -> {viewer_id: last_seen}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._pollers: Dict[str, threading.Event] = {}  # device_id -> stop event
+        self._ready: Dict[str, threading.Event] = {}
+        self._buffers: Dict[str, SensorHistoryBuffer] = {}
+        self._windows: Dict[tuple, tuple] = {}  # (device_id, hours) -> (time bucket, reduced readings)
+        self._devices: List[str] = []
+        self._devices_fetched_at = 0.0
+        self._devices_lock = threading.Lock()
+
+    # Subscriptions
+    def subscribe(self, device_id: str, viewer_id: str):
+        """Register or renew a viewer lease on a device, starting its poller if needed"""
+        now = time.monotonic()
+        with self._lock:
+            # A viewer watches one device at a time
+            for other_id, viewers in self._viewers.items():
+                if other_id != device_id:
+                    viewers.pop(viewer_id, None)
+
+            self._viewers.setdefault(device_id, {})[viewer_id] = now
+            if self.stream is not None:
+                self.stream.start()
+            if device_id not in self._pollers:
+                stop_event = threading.Event()
+                self._pollers[device_id] = stop_event
+                # Not ready until the new poller lands its first snapshot; one left
+                # by a poller that stopped may be arbitrarily old
+                self._ready.setdefault(device_id, threading.Event()).clear()
+                threading.Thread(
+                    target=self._poll_loop,
+                    args=(device_id, stop_event),
+                    name=f"vayu-poller-{device_id}",
+                    daemon=True
+                ).start()
+
+    def unsubscribe(self, device_id: str, viewer_id: str):
+        """Release a viewer lease; the poller stops after its last viewer leaves"""
+        with self._lock:
+            viewers = self._viewers.get(device_id, {})
+            viewers.pop(viewer_id, None)
+            if not viewers and device_id in self._pollers:
+                self._viewers.pop(device_id, None)
+                self._pollers.pop(device_id).set()
+                self._stop_stream_if_idle()
+
+    def _stop_stream_if_idle(self):
+        """Close the event stream once no device has a poller (caller holds the lock)"""
+        if self.stream is not None and not self._pollers:
+            self.stream.stop()
+
+    def viewer_count(self, device_id: str) -> int:
+        """Number of live viewer leases on a device"""
+        with self._lock:
+            return len(self._viewers.get(device_id, {}))
+
+    # Snapshots
+    def get_snapshot(self, device_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Latest published snapshot for a device
+        Optionally block up to `wait` seconds for the first poll to land
+        """
+        ready = self._ready.get(device_id)
+        if wait and ready is not None:
+            ready.wait(wait)
+        with self._lock:
+            return self._snapshots.get(device_id)
+
+    def get_devices(self) -> List[str]:
+        """Device list shared across sessions, refreshed at most every DEVICE_LIST_TTL seconds"""
+        with self._devices_lock:
+            if time.monotonic() - self._devices_fetched_at >= DEVICE_LIST_TTL:
+                with latency_budget(PAGE_LATENCY_BUDGET):
+                    self._devices = self.client.get_devices()
+                self._devices_fetched_at = time.monotonic()
+            return list(self._devices)
+
+    def get_history_buffer(self, device_id: str) -> SensorHistoryBuffer:
+        """Get (or lazily create) the history ring buffer for a device"""
+        with self._lock:
+            buffer = self._buffers.get(device_id)
+            if buffer is None:
+                buffer = self._buffers[device_id] = SensorHistoryBuffer(device_id, archive=self.archive)
+            return buffer
+
+    def get_history_window(self, device_id: str, hours: float) -> Optional[ReadingColumns]:
+        """
+        Readings of the last `hours` hours from the local archive (None without one)
+        Long windows are reduced to the min/max points the trend chart's
+        downsampling starts from, and cached per device until the window has
+        moved by one of those points, so sessions and fragment reruns share
+        one archive read.
+        """
+        if self.archive is None:
+            return None
+        n_out = target_points(HISTORY_CHART_WIDTH_PX) * DOWNSAMPLE_MINMAX_RATIO
+        bucket = int(time.time() * n_out // (hours * 3600))
+        key = (device_id, hours)
+        with self._lock:
+            cached = self._windows.get(key)
+        if cached is not None and cached[0] == bucket:
+            return cached[1]
+
+        readings = self.archive.window(device_id, hours)
+        if len(readings) > n_out:
+            columns = {field: getattr(readings, field) for field in SENSOR_FIELDS}
+            readings = readings.take(shared_indices(columns, n_out))
+        with self._lock:
+            self._windows[key] = (bucket, readings)
+        return readings
+
+    def _publish(self, device_id: str, snapshot: Dict[str, Any]):
+        """Store a new snapshot version and wake waiting callers (caller holds the lock)"""
+        version = self._versions.get(device_id, 0) + 1
+        snapshot["version"] = version
+        self._versions[device_id] = version
+        self._snapshots[device_id] = snapshot
+        self._lock.notify_all()
+
+    # Live stream
+    def _on_stream_event(self, event_type: str, data: Any):
+        """Apply one pushed event to the watched device's snapshot"""
+        if not isinstance(data, dict) or not data.get("device_id"):
+            return
+        device_id = data["device_id"]
+        if event_type not in ("sensor_reading", "control_status", "blockchain_log"):
+            return
+        with self._lock:
+            if device_id not in self._snapshots or device_id not in self._viewers:
+                return
+
+        reading_update = None
+        if event_type == "sensor_reading":
+            buffer = self.get_history_buffer(device_id)
+            if not buffer.extend([data]):
+                return
+            reading_update = (buffer.columns(HISTORY_CHART_LIMIT), buffer.summaries(), buffer.latest())
+
+        with self._lock:
+            # Copy-on-write from the snapshot current under the lock, so a poll
+            # published meanwhile is never overwritten with older fields
+            current = self._snapshots.get(device_id)
+            if current is None:
+                return
+            snapshot = dict(current, updated_at=time.time())
+            dashboard_data = dict(snapshot.get("dashboard_data") or {})
+            if reading_update is not None:
+                snapshot["history"], snapshot["analytics"], dashboard_data["current_reading"] = reading_update
+            elif event_type == "control_status":
+                dashboard_data["control_status"] = data
+            else:
+                dashboard_data["recent_logs"] = [data] + list(dashboard_data.get("recent_logs") or [])[:9]
+            snapshot["dashboard_data"] = dashboard_data
+            self._publish(device_id, snapshot)
+
+    # Polling
+    def _fetch(self, device_id: str, sync_history: bool = True) -> Dict[str, Any]:
+        """Fetch one snapshot for a device within one shared latency budget"""
+        with latency_budget(PAGE_LATENCY_BUDGET):
+            return self._fetch_unbounded(device_id, sync_history)
+
+    def _fetch_unbounded(self, device_id: str, sync_history: bool = True) -> Dict[str, Any]:
+        snapshot = {"dashboard_data": {}, "history": None, "analytics": None, "error": None, "updated_at": time.time()}
+        buffer = self.get_history_buffer(device_id)
+        history_error = None
+        if sync_history:
+            try:
+                # Only readings newer than the buffer's tail are downloaded
+                buffer.sync(self.client)
+            except APIError as e:
+                history_error = str(e)
+        snapshot["history"] = buffer.columns(HISTORY_CHART_LIMIT)
+        snapshot["analytics"] = buffer.summaries()
+        try:
+            dashboard_data = self.client.get_aggregated_dashboard_data(device_id, include_reading=False)
+            if not dashboard_data.get("current_reading"):
+                dashboard_data["current_reading"] = buffer.latest()
+            snapshot["dashboard_data"] = dashboard_data
+        except Exception as e:
+            snapshot["error"] = str(e)
+        if history_error:
+            # Reported like the aggregated fetch's failed sub-requests (copies: responses may be shared)
+            dashboard_data = snapshot["dashboard_data"] = dict(snapshot["dashboard_data"])
+            health = dashboard_data["system_health"] = dict(dashboard_data.get("system_health") or {})
+            health["errors"] = {**(health.get("errors") or {}), "sensor_history": history_error}
+        return snapshot
+
+    def _has_viewers(self, device_id: str, stop_event: threading.Event) -> bool:
+        """Expire stale leases; deregister this poller when none remain"""
+        cutoff = time.monotonic() - self.lease_ttl
+        with self._lock:
+            viewers = self._viewers.get(device_id, {})
+            for viewer_id in [v for v, seen in viewers.items() if seen < cutoff]:
+                del viewers[viewer_id]
+            if viewers:
+                return True
+            self._viewers.pop(device_id, None)
+            if self._pollers.get(device_id) is stop_event:
+                del self._pollers[device_id]
+                self._stop_stream_if_idle()
+            return False
+
+    def _poll_loop(self, device_id: str, stop_event: threading.Event):
+        """Poll a device once per interval while it has viewers"""
+        history_synced_at = None
+        while not stop_event.is_set():
+            # Pushed readings keep the history fresh; it is only reconciled now and then
+            live = self.stream is not None and self.stream.connected
+            now = time.monotonic()
+            sync_history = (not live or history_synced_at is None
+                            or now - history_synced_at >= STREAM_RECONCILE_INTERVAL)
+            if sync_history:
+                history_synced_at = now
+            try:
+                snapshot = self._fetch(device_id, sync_history)
+            except Exception as e:
+                # A bug must not end the poller (and leave viewers waiting); it is logged and shown
+                logger.exception("Dashboard poll failed for %s", device_id)
+                snapshot = {"dashboard_data": {}, "history": None, "analytics": None,
+                            "error": f"Internal error: {e}", "updated_at": time.time()}
+            with self._lock:
+                self._publish(device_id, snapshot)
+            self._ready[device_id].set()
+
+            if stop_event.is_set() or not self._has_viewers(device_id, stop_event):
+                break
+            stop_event.wait(self.interval)
+
+
+# Global data service instance (shared by every Streamlit session in the process)
+data_service = DashboardDataService(api_client, archive=timeseries_store)
@@ -0,0 +1,106 @@
+"""
+Fleet Overview Service
+Process-wide latest reading + sparkline for every device, refreshed in increments
+"""
+import threading
+import time
+from typing import Optional, Dict, List, Any
+
+from services.api_client import VayuAPIClient, APIError, api_client, latency_budget
+from utils.aqi import aqi_category, sub_index_scalar
+from utils.reading_store import ReadingStore
+from utils.constants import (
+    FLEET_REFRESH_INTERVAL, FLEET_REFRESH_BATCH, FLEET_MAX_CONCURRENCY, FLEET_SPARKLINE_POINTS,
+    PAGE_LATENCY_BUDGET
+)
+
+
+class FleetService:
+    """
+    One tile per device: latest reading, AQI category and a PM2.5 sparkline
+
+    A refresh pass walks the stalest devices in batches of FLEET_REFRESH_BATCH,
+    each batch one get_many_sensor_history call (batch endpoint, or at most
+    FLEET_MAX_CONCURRENCY single-device requests in flight). Tiles are
+    published after every batch, so pages render what has arrived so far;
+    every session in the process shares the same pass.
+    """
+
+    def __init__(self, client: VayuAPIClient):
+        self.client = client
+        self._lock = threading.Lock()
+        self._tiles: Dict[str, Dict[str, Any]] = {}
+        self._refresher: Optional[threading.Thread] = None
+
+    def tiles(self, device_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Current tile of every device (None until its first fetch)"""
+        with self._lock:
+            return {device_id: self._tiles.get(device_id) for device_id in device_ids}
+
+    def refresh(self, device_ids: List[str], wait: float = 0) -> bool:
+        """
+        Start a refresh pass over devices older than FLEET_REFRESH_INTERVAL
+        unless one is running, then wait up to `wait` seconds for it.
+        Returns True when no pass is still running.
+        """
+        with self._lock:
+            running = self._refresher is not None and self._refresher.is_alive()
+            if not running and self._stale(device_ids):
+                self._refresher = threading.Thread(target=self._refresh_pass, args=(list(device_ids),),
+                                                   name="vayu-fleet", daemon=True)
+                self._refresher.start()
+            refresher = self._refresher
+        if refresher is None:
+            return True
+        refresher.join(wait)
+        return not refresher.is_alive()
+
+    def _stale(self, device_ids: List[str]) -> List[str]:
+        """Devices due for a refresh, never-fetched first, then oldest (caller holds the lock)"""
+        cutoff = time.time() - FLEET_REFRESH_INTERVAL
+        ages = {d: (self._tiles.get(d) or {}).get("fetched_at", 0.0) for d in device_ids}
+        return sorted((d for d, fetched_at in ages.items() if fetched_at < cutoff), key=ages.get)
+
+    def _refresh_pass(self, device_ids: List[str]):
+        with self._lock:
+            stale = self._stale(device_ids)
+        for start in range(0, len(stale), FLEET_REFRESH_BATCH):
+            batch = stale[start:start + FLEET_REFRESH_BATCH]
+            try:
+                with latency_budget(PAGE_LATENCY_BUDGET):
+                    results = self.client.get_many_sensor_history(
+                        batch, limit=FLEET_SPARKLINE_POINTS, max_concurrency=FLEET_MAX_CONCURRENCY
+                    )
+            except APIError as e:
+                results = {device_id: e for device_id in batch}
+            tiles = {device_id: self._tile(device_id, result) for device_id, result in results.items()}
+            with self._lock:
+                self._tiles.update(tiles)
+
+    def _tile(self, device_id: str, result: Any) -> Dict[str, Any]:
+        """Tile from one device's recent readings (keeps the last good data on errors)"""
+        now = time.time()
+        if isinstance(result, Exception):
+            with self._lock:
+                previous = dict(self._tiles.get(device_id) or {})
+            previous.update(fetched_at=now, error=str(result))
+            return previous
+
+        columns = ReadingStore.from_readings(result).columns()
+        latest = columns.latest() or {}
+        pm25 = latest.get("pm25")
+        aqi = sub_index_scalar("pm25", pm25) if pm25 is not None else None
+        category, color = aqi_category(aqi) if aqi is not None else ("No data", "#666666")
+        return {
+            "reading": latest,
+            "aqi": aqi,
+            "category": category,
+            "color": color,
+            "sparkline": columns.pm25.copy(),
+            "fetched_at": now,
+            "error": None,
+        }
+
+
+# Global instance (shared by every Streamlit session in the process)
+fleet_service = FleetService(api_client)
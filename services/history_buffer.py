@@ -0,0 +1,114 @@
+"""
+Sensor History Buffer
+Fixed-capacity, per-device buffer of sensor readings synced incrementally
+"""
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, List
+
+from services.api_client import VayuAPIClient, APIError
+from services.timeseries_store import SensorTimeSeriesStore
+from utils.reading_store import ReadingStore, ReadingColumns, parse_timestamp_ns
+from utils.rolling_stats import RollingStats
+from utils.constants import HISTORY_BUFFER_CAPACITY, HISTORY_BACKFILL_LIMIT, HISTORY_SYNC_LIMIT
+
+
+def _iso(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class SensorHistoryBuffer:
+    """
+    Bounded history of one device's readings, oldest first
+
+    The first sync backfills HISTORY_BACKFILL_LIMIT readings; later syncs only
+    ask the backend for readings newer than the last buffered timestamp
+    (paging back from the newest, HISTORY_SYNC_LIMIT per page) and append
+    them, evicting the oldest once capacity is reached. Readings live in a
+    columnar ReadingStore so charts and metrics read numpy views; new
+    readings also feed O(1) rolling statistics and are appended to the
+    `archive` time-series store.
+    """
+
+    def __init__(self, device_id: str, capacity: int = HISTORY_BUFFER_CAPACITY,
+                 archive: Optional[SensorTimeSeriesStore] = None):
+        self.device_id = device_id
+        self.capacity = capacity
+        self.archive = archive
+        self._store = ReadingStore(capacity)
+        self._stats = RollingStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
+
+    def sync(self, client: VayuAPIClient) -> int:
+        """
+        Fetch readings newer than the buffer's tail; returns how many were appended
+        The backend answers with the newest readings of a range, so a gap longer
+        than one page is filled by paging backwards (`until` = oldest reading
+        so far) until a page reaches the tail, comes back short or makes no
+        progress - at most one buffer's worth per call. A failed follow-up
+        page keeps the pages already fetched.
+        """
+        with self._lock:
+            last_ns = self._store.last_timestamp_ns
+        if last_ns is None:
+            return self.extend(client.get_sensor_history(self.device_id, limit=HISTORY_BACKFILL_LIMIT))
+
+        since, until, oldest = _iso(last_ns), None, None
+        fetched: List[Dict] = []
+        while len(fetched) < self.capacity:
+            try:
+                page = client.get_sensor_history(self.device_id, limit=HISTORY_SYNC_LIMIT, since=since, until=until)
+            except APIError:
+                if not fetched:
+                    raise
+                break
+            fetched.extend(page)
+            stamps = [ts for reading in page if (ts := parse_timestamp_ns(reading.get("timestamp"))) is not None]
+            if len(page) < HISTORY_SYNC_LIMIT or not stamps:
+                break
+            # Reached the tail, or `until` was ignored and nothing older came back
+            page_oldest = min(stamps)
+            if page_oldest <= last_ns or (oldest is not None and page_oldest >= oldest):
+                break
+            oldest = page_oldest
+            until = _iso(oldest)
+        return self.extend(fetched)
+
+    def extend(self, readings: List[Dict]) -> int:
+        """
+        Append readings newer than the tail, in timestamp order
+        Backends that ignore `since` resend known readings - those are dropped.
+        Appended readings also update the rolling statistics and are written
+        to the on-disk archive, if any.
+        """
+        with self._lock:
+            appended = self._store.extend(readings)
+            if appended:
+                added = self._store.columns(appended)
+                self._stats.update_columns(added)
+                if self.archive is not None:
+                    self.archive.append(self.device_id, added)
+            return appended
+
+    def latest(self) -> Optional[Dict]:
+        """Most recent reading, if any"""
+        with self._lock:
+            return self._store.columns(1).latest()
+
+    def columns(self, limit: Optional[int] = None) -> ReadingColumns:
+        """Zero-copy columnar view of the newest `limit` readings (all when None)"""
+        with self._lock:
+            return self._store.columns(limit)
+
+    def summaries(self) -> Dict[str, Dict[str, Dict]]:
+        """Rolling statistics for every window: {window: {sensor: {stat: value}}}"""
+        with self._lock:
+            return self._stats.summaries()
+
+    def readings(self, limit: Optional[int] = None) -> List[Dict]:
+        """Newest `limit` readings (all when None) as dicts, oldest first"""
+        return self.columns(limit).to_records()
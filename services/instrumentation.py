@@ -0,0 +1,284 @@
+"""
+Hot-Path Instrumentation
+Process-wide latency histograms and counters for backend calls and section
+renders, exported in Prometheus text format (HTTP endpoint and/or file)
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, List, Tuple, Any, Callable
+from dotenv import load_dotenv
+
+from utils.constants import METRICS_LATENCY_BUCKETS, METRICS_FILE_INTERVAL
+
+# Load environment variables
+load_dotenv()
+
+# name -> (type, help) of every exported metric
+METRICS = {
+    "vayu_http_request_duration_seconds": ("histogram", "Backend request latency (incl. retries), by method and route"),
+    "vayu_http_decode_duration_seconds": ("histogram", "JSON decoding time of backend responses, by route"),
+    "vayu_http_responses_total": ("counter", "Backend responses, by method, route and status code"),
+    "vayu_http_errors_total": ("counter", "Failed backend calls, by method, route and kind"),
+    "vayu_http_response_bytes_total": ("counter", "Backend response body bytes received, by method and route"),
+    "vayu_http_coalesced_total": ("counter", "GET calls that joined an identical in-flight request, by route"),
+    "vayu_render_duration_seconds": ("histogram", "Render time of dashboard sections, by page and section"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram (per-bucket counts, cumulated on export)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or above the last bucket)"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels"""
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, labels: Dict[str, Any], amount: float = 1):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Dict[str, Any], value: float):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # Hot-path helpers
+    def observe_request(self, method: str, route: str, status: Optional[int], seconds: float, size: int):
+        """One backend response (status None when no response arrived)"""
+        self.observe("vayu_http_request_duration_seconds", {"method": method, "route": route}, seconds)
+        self.inc("vayu_http_responses_total", {"method": method, "route": route, "status": status or "none"})
+        if size:
+            self.inc("vayu_http_response_bytes_total", {"method": method, "route": route}, size)
+
+    def observe_decode(self, route: str, seconds: float):
+        self.observe("vayu_http_decode_duration_seconds", {"route": route}, seconds)
+
+    def count_error(self, method: str, route: str, kind: str):
+        self.inc("vayu_http_errors_total", {"method": method, "route": route, "kind": kind})
+
+    def count_coalesced(self, route: str):
+        self.inc("vayu_http_coalesced_total", {"route": route})
+
+    @contextmanager
+    def render_timer(self, page: str, section: str):
+        """Time the enclosed block as one render of a page section"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("vayu_render_duration_seconds", {"page": page, "section": section},
+                         time.perf_counter() - started)
+
+    # Export
+    def prometheus_text(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {k: (list(h.counts), h.sum, h.count) for k, h in series.items()}
+                          for name, series in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            series = counters.get(name) if kind == "counter" else histograms.get(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series.items()):
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def endpoint_summary(self) -> List[Dict[str, Any]]:
+        """One row per (method, route): calls, errors, coalesced joins, bytes and latency (for the debug panel)"""
+        with self._lock:
+            latency = dict(self._histograms.get("vayu_http_request_duration_seconds", {}))
+            decode = {dict(k)["route"]: h for k, h in self._histograms.get("vayu_http_decode_duration_seconds", {}).items()}
+            errors, size = {}, dict(self._counters.get("vayu_http_response_bytes_total", {}))
+            coalesced = {dict(k)["route"]: n for k, n in self._counters.get("vayu_http_coalesced_total", {}).items()}
+            for labels, count in self._counters.get("vayu_http_errors_total", {}).items():
+                key = tuple(item for item in labels if item[0] != "kind")
+                errors[key] = errors.get(key, 0) + count
+            rows = []
+            for labels, h in sorted(latency.items()):
+                route = dict(labels)["route"]
+                rows.append({
+                    **dict(labels),
+                    "calls": h.count,
+                    "errors": int(errors.get(labels, 0)),
+                    "coalesced": int(coalesced.get(route, 0)) if dict(labels)["method"] == "GET" else 0,
+                    "kB": round(size.get(labels, 0) / 1024, 1),
+                    "mean ms": round(h.sum / h.count * 1000, 1),
+                    "p95 ms ≤": _ms(h.quantile(0.95)),
+                    "decode ms": round(decode[route].sum / decode[route].count * 1000, 2) if route in decode else None,
+                })
+        return rows
+
+    def render_summary(self) -> List[Dict[str, Any]]:
+        """One row per (page, section): renders and latency (for the debug panel)"""
+        with self._lock:
+            series = dict(self._histograms.get("vayu_render_duration_seconds", {}))
+            return [{
+                **dict(labels),
+                "renders": h.count,
+                "mean ms": round(h.sum / h.count * 1000, 1),
+                "p95 ms ≤": _ms(h.quantile(0.95)),
+            } for labels, h in sorted(series.items())]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def timed_section(page: str, section: str) -> Callable:
+    """Decorator: record every call of a section render function"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metrics.render_timer(page, section):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsExporter:
+    """
+    Serves the registry at http://<host>:<port>/metrics and/or rewrites it to
+    a file every METRICS_FILE_INTERVAL seconds (node_exporter textfile style)
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: Optional[int] = None, path: Optional[str] = None,
+                 host: str = "0.0.0.0", interval: float = METRICS_FILE_INTERVAL):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._server: Optional[ThreadingHTTPServer] = None
+        if port:
+            self._server = ThreadingHTTPServer((host, port), self._handler())
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="vayu-metrics-http", daemon=True).start()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            threading.Thread(target=self._write_loop, name="vayu-metrics-file", daemon=True).start()
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def write_file(self):
+        """Atomically replace the metrics file with the current registry"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.registry.prometheus_text())
+        os.replace(tmp, self.path)
+
+    def _write_loop(self):
+        while True:
+            try:
+                self.write_file()
+            except OSError:
+                pass
+            time.sleep(self.interval)
+
+
+def _start_exporter(registry: MetricsRegistry) -> Optional[MetricsExporter]:
+    """Exporter for METRICS_PORT / METRICS_FILE (env; both empty disables it)"""
+    port = os.getenv("METRICS_PORT", "")
+    path = os.getenv("METRICS_FILE", "")
+    if not port and not path:
+        return None
+    try:
+        return MetricsExporter(registry, port=int(port) if port else None, path=path or None)
+    except (OSError, ValueError):
+        return None
+
+
+# Global instances (one registry per process, shared by every session)
+metrics = MetricsRegistry()
+metrics_exporter = _start_exporter(metrics)
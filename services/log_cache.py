@@ -0,0 +1,198 @@
+"""
+Persistent Blockchain Log Cache
+On-disk (SQLite) store of blockchain logs keyed by hash, synced incrementally
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional, Dict, List, Any, Iterable, Tuple
+from dotenv import load_dotenv
+
+from services.api_client import VayuAPIClient, api_client, latency_budget
+from utils.reading_store import parse_timestamp_ns
+from utils.constants import LOG_CACHE_PATH, LOG_SYNC_PAGE_SIZE, PAGE_LATENCY_BUDGET
+
+# Load environment variables
+load_dotenv()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    hash TEXT PRIMARY KEY,
+    event_type TEXT,
+    device_id TEXT,
+    timestamp TEXT,
+    timestamp_ns INTEGER,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_time ON logs (timestamp_ns DESC);
+CREATE INDEX IF NOT EXISTS logs_type_time ON logs (event_type, timestamp_ns DESC);
+CREATE INDEX IF NOT EXISTS logs_device_time ON logs (device_id, timestamp_ns DESC);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class BlockchainLogCache:
+    """
+    Local copy of the blockchain log, newest entries synced first
+
+    Logs are immutable, so entries are only ever inserted. A sync first asks
+    the backend for entries newer than the newest cached one, then continues
+    the one-time backfill of older history; both passes save their cursor, so
+    an interrupted pass resumes across runs and restarts. Pages read,
+    filter and count from the cache and never wait on the backend.
+    """
+
+    def __init__(self, client: VayuAPIClient, path: str):
+        self.client = client
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+
+    # Writes
+    def insert(self, logs: Iterable[Dict]) -> int:
+        """Store logs not cached yet; returns how many were new"""
+        rows = [
+            (log["hash"], log.get("event_type"), log.get("device_id"), log.get("timestamp"),
+             parse_timestamp_ns(log.get("timestamp")), json.dumps(log, default=str))
+            for log in logs if log.get("hash")
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return self._conn.total_changes - before
+
+    def _state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: Optional[str]):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    # Sync
+    def sync(self) -> int:
+        """Fetch entries newer than the cache, then resume the history backfill"""
+        added = 0
+        # The catch-up pass keeps its lower bound and cursor in sync_state until it
+        # reaches the end: newest-first pages move the newest cached entry forward,
+        # so restarting from it after an interruption would skip the gap below
+        since = self._state("catchup_since") or self.newest_timestamp()
+        if since is not None:
+            self._set_state("catchup_since", since)
+            while True:
+                page = self.client.get_blockchain_log_page(LOG_SYNC_PAGE_SIZE, since=since,
+                                                           cursor=self._state("catchup_cursor"))
+                added += self.insert(page["logs"])
+                if not page["next_cursor"]:
+                    break
+                self._set_state("catchup_cursor", page["next_cursor"])
+            self._set_state("catchup_cursor", None)
+            self._set_state("catchup_since", None)
+
+        while self._state("backfilled") != "1":
+            page = self.client.get_blockchain_log_page(LOG_SYNC_PAGE_SIZE, cursor=self._state("backfill_cursor"))
+            added += self.insert(page["logs"])
+            if page["next_cursor"]:
+                self._set_state("backfill_cursor", page["next_cursor"])
+            else:
+                self._set_state("backfilled", "1")
+        return added
+
+    def sync_in_background(self, wait: float = 0) -> bool:
+        """
+        Start a sync thread unless one is running, then wait up to `wait`
+        seconds for it; returns True if no sync is still in progress
+        """
+        with self._lock:
+            if self._sync_thread is None or not self._sync_thread.is_alive():
+                self._sync_thread = threading.Thread(target=self._sync_worker, name="vayu-log-cache", daemon=True)
+                self._sync_thread.start()
+            thread = self._sync_thread
+        thread.join(wait)
+        return not thread.is_alive()
+
+    def _sync_worker(self):
+        try:
+            with latency_budget(PAGE_LATENCY_BUDGET):
+                self.sync()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+
+    # Queries
+    def complete(self) -> bool:
+        """The history backfill has finished and no catch-up pass is in progress"""
+        return self._state("backfilled") == "1" and self._state("catchup_since") is None
+
+    def entries_after(self, rowid: int, limit: int) -> List[Tuple[int, Dict]]:
+        """Up to `limit` (rowid, log) pairs in insertion order after `rowid` (for incremental readers)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT rowid, body FROM logs WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                                      (rowid, limit)).fetchall()
+        return [(row_id, json.loads(body)) for row_id, body in rows]
+
+    def newest_timestamp(self) -> Optional[str]:
+        """Timestamp of the newest cached entry (None when the cache is empty)"""
+        with self._lock:
+            row = self._conn.execute("SELECT timestamp FROM logs ORDER BY timestamp_ns DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _where(event_types: Optional[Iterable[str]], device_id: Optional[str],
+               since: Optional[str], until: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if event_types:
+            event_types = list(event_types)
+            clauses.append(f"event_type IN ({', '.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if device_id:
+            clauses.append("device_id = ?")
+            params.append(device_id)
+        if since:
+            clauses.append("timestamp_ns >= ?")
+            params.append(parse_timestamp_ns(since))
+        if until:
+            clauses.append("timestamp_ns <= ?")
+            params.append(parse_timestamp_ns(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit: int = 20, offset: int = 0, event_types: Optional[Iterable[str]] = None,
+              device_id: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Dict]:
+        """Cached logs matching the filters, newest first"""
+        where, params = self._where(event_types, device_id, since, until)
+        sql = f"SELECT body FROM logs{where} ORDER BY timestamp_ns DESC, hash LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit, offset]).fetchall()
+        return [json.loads(body) for body, in rows]
+
+    def counts(self, event_types: Optional[Iterable[str]] = None, device_id: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, int]:
+        """Cached log count per event type for the filters (one GROUP BY)"""
+        where, params = self._where(event_types, device_id, since, until)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT event_type, COUNT(*) FROM logs{where} GROUP BY event_type", params).fetchall()
+        return {event_type or "unknown": count for event_type, count in rows}
+
+
+def _open_cache() -> Optional[BlockchainLogCache]:
+    """Cache at LOG_CACHE_PATH (env overridable; empty disables it)"""
+    path = os.getenv("LOG_CACHE_PATH", LOG_CACHE_PATH)
+    if not path:
+        return None
+    try:
+        return BlockchainLogCache(api_client, path)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+# Global instance (None when disabled or the path is not writable)
+log_cache = _open_cache()
@@ -0,0 +1,158 @@
+"""
+Streaming Client for VAYU AI Backend
+Consumes the server-sent-events feed of sensor readings, control changes
+and blockchain events, reconnecting automatically
+"""
+import json
+import os
+import threading
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator
+
+import requests
+from dotenv import load_dotenv
+
+from utils.constants import (
+    HTTP_CONNECT_TIMEOUT, STREAM_ENDPOINT, STREAM_READ_TIMEOUT,
+    STREAM_RECONNECT_MIN, STREAM_RECONNECT_MAX, CAPABILITY_TTL, UNSUPPORTED_STATUSES
+)
+
+# Load environment variables
+load_dotenv()
+
+
+def parse_sse(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse text/event-stream lines into events
+    Yields {"id", "event", "data"} with data JSON-decoded when possible
+    """
+    event_id, event_type, data_lines = None, "message", []
+    for line in lines:
+        if line is None:
+            continue
+        if line == "":
+            # Blank line dispatches the event
+            if data_lines:
+                raw = "\n".join(data_lines)
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = raw
+                yield {"id": event_id, "event": event_type, "data": data}
+            event_type, data_lines = "message", []
+            continue
+        if line.startswith(":"):
+            # Comment / heartbeat
+            continue
+
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "data":
+            data_lines.append(value)
+        elif field == "event":
+            event_type = value
+        elif field == "id":
+            event_id = value
+
+
+class VayuStreamClient:
+    """
+    Background subscriber to the backend's live event feed
+
+    Each event is handed to on_event(event_type, data). The connection is
+    re-established with exponential backoff (reset by every received event)
+    and resumes from the last seen event id; a backend without the feed is
+    re-probed every CAPABILITY_TTL.
+    """
+
+    def __init__(self, on_event: Callable[[str, Any], None], base_url: Optional[str] = None,
+                 endpoint: str = STREAM_ENDPOINT):
+        self.base_url = base_url or os.getenv("BACKEND_URL", "http://localhost:8000")
+        self.endpoint = endpoint
+        self.on_event = on_event
+        self.last_event_id: Optional[str] = None
+        self.connected = False
+        self.supported = True
+        self._lock = threading.Lock()
+        # One stop event per consumer thread, so a restart never revives a stopping one
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response: Optional[requests.Response] = None
+        self._backoff = STREAM_RECONNECT_MIN
+        # Dedicated session: the stream holds its connection open indefinitely
+        self._session = requests.Session()
+
+    def start(self):
+        """Start consuming the feed in a daemon thread (no-op if running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set():
+                return
+            self._stop_event = threading.Event()
+            self._backoff = STREAM_RECONNECT_MIN
+            self._thread = threading.Thread(target=self._run, args=(self._stop_event,), name="vayu-stream", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop consuming and close the connection"""
+        with self._lock:
+            self._stop_event.set()
+            response, self._response = self._response, None
+            self.connected = False
+        if response is not None:
+            response.close()
+
+    def _run(self, stop_event: threading.Event):
+        """Connect / consume / reconnect until stopped"""
+        while not stop_event.is_set():
+            try:
+                self._consume(stop_event)
+            except requests.exceptions.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else None
+                if status_code in UNSUPPORTED_STATUSES:
+                    # Backend has no live feed - callers keep polling
+                    self.supported = False
+                    stop_event.wait(CAPABILITY_TTL)
+                    continue
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            finally:
+                with self._lock:
+                    if self._stop_event is stop_event:
+                        self.connected = False
+                        self._response = None
+
+            # Backoff restarts from the minimum once a connection delivered an event
+            stop_event.wait(self._backoff)
+            self._backoff = min(self._backoff * 2, STREAM_RECONNECT_MAX)
+
+    def _consume(self, stop_event: threading.Event):
+        """Hold one streaming connection and dispatch its events"""
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        response = self._session.get(
+            f"{self.base_url}{self.endpoint}",
+            headers=headers,
+            stream=True,
+            timeout=(HTTP_CONNECT_TIMEOUT, STREAM_READ_TIMEOUT)
+        )
+        with self._lock:
+            if stop_event.is_set():
+                response.close()
+                return
+            self._response = response
+        response.raise_for_status()
+        self.connected = True
+        self.supported = True
+
+        for event in parse_sse(response.iter_lines(decode_unicode=True)):
+            if stop_event.is_set():
+                break
+            self._backoff = STREAM_RECONNECT_MIN
+            if event["id"]:
+                self.last_event_id = event["id"]
+            try:
+                self.on_event(event["event"], event["data"])
+            except Exception:
+                # A bad event must not drop the connection
+                continue
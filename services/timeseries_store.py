@@ -0,0 +1,222 @@
+"""
+Local Sensor Time-Series Store
+Append-only columnar files per device and UTC day, read back through memory maps
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Tuple
+from dotenv import load_dotenv
+
+import numpy as np
+
+from utils.reading_store import ReadingColumns
+from utils.constants import (
+    SENSOR_FIELDS, TIMESERIES_PATH, TIMESERIES_RAW_DAYS, TIMESERIES_RETENTION_DAYS,
+    TIMESERIES_COMPACT_BUCKET, TIMESERIES_COMPACT_INTERVAL
+)
+
+# Load environment variables
+load_dotenv()
+
+# One fixed-width record per reading: epoch ns + one float64 per sensor
+RECORD_DTYPE = np.dtype([("timestamp", "<i8")] + [(field, "<f8") for field in SENSOR_FIELDS])
+NS_PER_DAY = 86_400 * 1_000_000_000
+RAW_SUFFIX = ".bin"
+COMPACTED_SUFFIX = ".compact.bin"
+_DAY_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})(\.compact)?\.bin$")
+
+
+def _day_name(day: int) -> str:
+    """Days since epoch -> YYYY-MM-DD"""
+    return str(np.datetime64(day, "D"))
+
+
+def _day_number(name: str) -> int:
+    return int(np.datetime64(name, "D").astype(np.int64))
+
+
+class SensorTimeSeriesStore:
+    """
+    Readings on disk as `<root>/<device>/<YYYY-MM-DD>.bin`, oldest first
+
+    Each day file is a packed array of RECORD_DTYPE; appends only add
+    readings newer than the device's last stored one, so every file stays
+    sorted and a time range is two binary searches on a memory map. Days
+    older than `raw_days` are compacted to TIMESERIES_COMPACT_BUCKET means
+    (`.compact.bin`), and days older than `retention_days` are deleted.
+    """
+
+    def __init__(self, root: str, raw_days: int = TIMESERIES_RAW_DAYS,
+                 retention_days: int = TIMESERIES_RETENTION_DAYS):
+        self.root = root
+        self.raw_days = raw_days
+        self.retention_days = retention_days
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._device_locks: Dict[str, threading.Lock] = {}
+        self._last_ns: Dict[str, Optional[int]] = {}
+        self._compacted_at = 0.0
+
+    # Layout
+    def _device_dir(self, device_id: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9_.-]", "_", device_id))
+
+    def _dir_lock(self, directory: str) -> threading.Lock:
+        with self._lock:
+            return self._device_locks.setdefault(directory, threading.Lock())
+
+    def _day_files(self, device_id: str) -> List[Tuple[int, str]]:
+        """(day, path) for every stored day of a device, oldest first"""
+        directory = self._device_dir(device_id)
+        if not os.path.isdir(directory):
+            return []
+        files = []
+        for name in os.listdir(directory):
+            match = _DAY_FILE.match(name)
+            if match:
+                files.append((_day_number(match.group(1)), os.path.join(directory, name)))
+        return sorted(files)
+
+    @staticmethod
+    def _load(path: str) -> np.ndarray:
+        """Memory-mapped records of one day file (empty array for empty files)"""
+        if os.path.getsize(path) < RECORD_DTYPE.itemsize:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r")
+
+    # Writes
+    def last_timestamp_ns(self, device_id: str) -> Optional[int]:
+        """Newest stored timestamp of a device in epoch ns"""
+        with self._lock:
+            if device_id in self._last_ns:
+                return self._last_ns[device_id]
+        files = self._day_files(device_id)
+        records = self._load(files[-1][1]) if files else np.empty(0, dtype=RECORD_DTYPE)
+        last = int(records["timestamp"][-1]) if len(records) else None
+        with self._lock:
+            self._last_ns.setdefault(device_id, last)
+            return self._last_ns[device_id]
+
+    def append(self, device_id: str, readings: ReadingColumns) -> int:
+        """Append readings newer than the device's last stored one; returns how many"""
+        records = np.empty(len(readings), dtype=RECORD_DTYPE)
+        records["timestamp"] = readings.timestamp.astype("datetime64[ns]").astype(np.int64)
+        for field in SENSOR_FIELDS:
+            records[field] = getattr(readings, field)
+
+        directory = self._device_dir(device_id)
+        with self._dir_lock(directory):
+            last = self.last_timestamp_ns(device_id)
+            if last is not None:
+                records = records[records["timestamp"] > last]
+            if not len(records):
+                return 0
+            records = records[np.argsort(records["timestamp"], kind="stable")]
+
+            os.makedirs(directory, exist_ok=True)
+            days = records["timestamp"] // NS_PER_DAY
+            boundaries = np.flatnonzero(np.diff(days)) + 1
+            for chunk in np.split(records, boundaries):
+                path = os.path.join(directory, _day_name(int(chunk["timestamp"][0] // NS_PER_DAY)) + RAW_SUFFIX)
+                with open(path, "ab") as f:
+                    f.write(chunk.tobytes())
+            with self._lock:
+                self._last_ns[device_id] = int(records["timestamp"][-1])
+
+        if time.monotonic() - self._compacted_at > TIMESERIES_COMPACT_INTERVAL:
+            self.compact()
+        return len(records)
+
+    # Reads
+    def range(self, device_id: str, start: datetime, end: Optional[datetime] = None) -> ReadingColumns:
+        """Readings with start <= timestamp < end (end defaults to now), oldest first"""
+        end = end or datetime.now(timezone.utc)
+        start_ns = int(start.timestamp() * 1e9)
+        end_ns = int(end.timestamp() * 1e9)
+        first_day, last_day = start_ns // NS_PER_DAY, end_ns // NS_PER_DAY
+
+        parts = []
+        for day, path in self._day_files(device_id):
+            if first_day <= day <= last_day:
+                records = self._load(path)
+                timestamps = records["timestamp"]
+                lo, hi = np.searchsorted(timestamps, [start_ns, end_ns])
+                if hi > lo:
+                    parts.append(records[lo:hi])
+
+        if len(parts) == 1:
+            selected = parts[0]  # still a view into the memory map
+        else:
+            selected = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+        return ReadingColumns(
+            selected["timestamp"].view("datetime64[ns]"),
+            **{field: selected[field] for field in SENSOR_FIELDS}
+        )
+
+    def window(self, device_id: str, hours: float) -> ReadingColumns:
+        """Readings of the last `hours` hours"""
+        end = datetime.now(timezone.utc)
+        return self.range(device_id, datetime.fromtimestamp(end.timestamp() - hours * 3600, tz=timezone.utc), end)
+
+    # Retention
+    def compact(self, now: Optional[datetime] = None):
+        """Downsample days older than raw_days and delete days older than retention_days"""
+        self._compacted_at = time.monotonic()
+        today = int((now or datetime.now(timezone.utc)).timestamp() * 1e9) // NS_PER_DAY
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            directory = os.path.join(self.root, name)
+            if not os.path.isdir(directory):
+                continue
+            with self._dir_lock(directory):
+                for file_name in os.listdir(directory):
+                    match = _DAY_FILE.match(file_name)
+                    if not match:
+                        continue
+                    path = os.path.join(directory, file_name)
+                    age = today - _day_number(match.group(1))
+                    if age > self.retention_days:
+                        os.remove(path)
+                    elif age > self.raw_days and not match.group(2):
+                        self._compact_file(path, path[:-len(RAW_SUFFIX)] + COMPACTED_SUFFIX)
+
+    @staticmethod
+    def _compact_file(path: str, target: str):
+        """Rewrite one raw day file as per-bucket means (NaN-aware), then drop the raw file"""
+        records = np.fromfile(path, dtype=RECORD_DTYPE)
+        if len(records):
+            bucket_ns = int(TIMESERIES_COMPACT_BUCKET * 1e9)
+            buckets = records["timestamp"] // bucket_ns
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+            compacted = np.empty(len(starts), dtype=RECORD_DTYPE)
+            compacted["timestamp"] = buckets[starts] * bucket_ns
+            for field in SENSOR_FIELDS:
+                values = records[field]
+                present = ~np.isnan(values)
+                sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+                counts = np.add.reduceat(present.astype(np.int64), starts)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    compacted[field] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            tmp = target + ".tmp"
+            compacted.tofile(tmp)
+            os.replace(tmp, target)
+        os.remove(path)
+
+
+def _open_store() -> Optional[SensorTimeSeriesStore]:
+    """Store at TIMESERIES_PATH (env overridable; empty disables it)"""
+    path = os.getenv("TIMESERIES_PATH", TIMESERIES_PATH)
+    if not path:
+        return None
+    try:
+        return SensorTimeSeriesStore(path)
+    except OSError:
+        return None
+
+
+# Global instance (None when disabled or the path is not writable)
+timeseries_store = _open_store()
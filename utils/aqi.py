@@ -0,0 +1,105 @@
+"""
+EPA Air Quality Index Engine
+Piecewise-linear AQI sub-indices computed over whole arrays, with a scalar fast path
+"""
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.constants import AQI_BREAKPOINTS, AQI_CATEGORIES, AQI_MAX, COLOR_INFO
+
+ArrayLike = Union[float, np.ndarray]
+
+# Breakpoint tables as arrays, built once: pollutant -> (c_lo, c_hi, i_lo, i_hi, decimals)
+_TABLES = {
+    pollutant: tuple(np.array(column, dtype=np.float64) for column in zip(*rows)) + (decimals,)
+    for pollutant, (_, decimals, rows) in AQI_BREAKPOINTS.items()
+}
+# Plain lists for the scalar path (bisect beats numpy on single values)
+_SCALAR_TABLES = {
+    pollutant: ([row[1] for row in rows], rows, decimals)
+    for pollutant, (_, decimals, rows) in AQI_BREAKPOINTS.items()
+}
+_CATEGORY_BOUNDS = np.array([bound for bound, _, _ in AQI_CATEGORIES], dtype=np.float64)
+CATEGORY_LABELS = np.array([label for _, label, _ in AQI_CATEGORIES])
+CATEGORY_COLORS = np.array([color for _, _, color in AQI_CATEGORIES])
+
+
+def _truncate(values: np.ndarray, decimals: int) -> np.ndarray:
+    """EPA truncates (not rounds) concentrations before lookup"""
+    scale = 10.0 ** decimals
+    # Small epsilon keeps 35.4 from becoming 35.39999 after float scaling
+    return np.floor(values * scale + 1e-9) / scale
+
+
+def sub_index(pollutant: str, concentrations: ArrayLike) -> np.ndarray:
+    """
+    AQI sub-index for every concentration of one pollutant
+    NaN and negative inputs yield NaN; values above the table cap at AQI_MAX
+    """
+    c_lo, c_hi, i_lo, i_hi, decimals = _TABLES[pollutant]
+    c = _truncate(np.asarray(concentrations, dtype=np.float64), decimals)
+
+    # First breakpoint whose upper edge covers the value
+    idx = np.minimum(np.searchsorted(c_hi, c, side="left"), len(c_hi) - 1)
+    aqi = (i_hi[idx] - i_lo[idx]) / (c_hi[idx] - c_lo[idx]) * (c - c_lo[idx]) + i_lo[idx]
+    aqi = np.where(c > c_hi[-1], AQI_MAX, np.rint(np.maximum(aqi, i_lo[idx])))
+    return np.where(np.isnan(c) | (c < 0), np.nan, aqi)
+
+
+def sub_index_scalar(pollutant: str, concentration: Optional[float]) -> Optional[int]:
+    """Scalar fast path of sub_index; None for missing/negative input"""
+    if concentration is None or concentration != concentration or concentration < 0:
+        return None
+    upper_edges, rows, decimals = _SCALAR_TABLES[pollutant]
+    scale = 10 ** decimals
+    c = int(concentration * scale + 1e-9) / scale
+    if c > upper_edges[-1]:
+        return AQI_MAX
+    c_lo, c_hi, i_lo, i_hi = rows[bisect_left(upper_edges, c)]
+    return int(round(max((i_hi - i_lo) / (c_hi - c_lo) * (c - c_lo) + i_lo, i_lo)))
+
+
+def compute_aqi(concentrations: Dict[str, ArrayLike]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Overall AQI (max sub-index) for aligned arrays of several pollutants
+    Unknown keys (e.g. co2, voc - not EPA AQI pollutants) are ignored.
+    Returns (aqi, dominant pollutant name per element).
+    """
+    pollutants = [p for p in concentrations if p in _TABLES]
+    if not pollutants:
+        raise ValueError("No EPA AQI pollutant in input")
+    stacked = np.vstack([np.atleast_1d(sub_index(p, concentrations[p])) for p in pollutants])
+    filled = np.where(np.isnan(stacked), -1, stacked)
+    dominant_idx = np.argmax(filled, axis=0)
+    aqi = np.where(np.all(np.isnan(stacked), axis=0), np.nan, np.nanmax(filled, axis=0))
+    return aqi, np.array(pollutants)[dominant_idx]
+
+
+def compute_aqi_scalar(**concentrations: Optional[float]) -> Tuple[Optional[int], Optional[str]]:
+    """Overall AQI and dominant pollutant for one reading, e.g. compute_aqi_scalar(pm25=14.2, co=0.8)"""
+    best, dominant = None, None
+    for pollutant, value in concentrations.items():
+        if pollutant not in _SCALAR_TABLES:
+            continue
+        aqi = sub_index_scalar(pollutant, value)
+        if aqi is not None and (best is None or aqi > best):
+            best, dominant = aqi, pollutant
+    return best, dominant
+
+
+def category_index(aqi: ArrayLike) -> np.ndarray:
+    """Index into AQI_CATEGORIES for every AQI value"""
+    return np.minimum(np.searchsorted(_CATEGORY_BOUNDS, np.asarray(aqi, dtype=np.float64), side="left"),
+                      len(_CATEGORY_BOUNDS) - 1)
+
+
+def aqi_category(aqi: Optional[float]) -> Tuple[str, str]:
+    """Category label and color for one AQI value"""
+    if aqi is None:
+        return "Unknown", COLOR_INFO
+    for bound, label, color in AQI_CATEGORIES:
+        if aqi <= bound:
+            return label, color
+    return AQI_CATEGORIES[-1][1], AQI_CATEGORIES[-1][2]
@@ -5,12 +5,168 @@ Constants and Configuration for VAYU AI Dashboard
 # API Endpoints
 API_VERSION = "v1"
 
-# Sensor thresholds for color coding
-PM25_GOOD = 12.0
-PM25_MODERATE = 35.5
-PM25_UNHEALTHY_SENSITIVE = 55.5
-PM25_UNHEALTHY = 150.5
-PM25_VERY_UNHEALTHY = 250.5
+# HTTP client (overridable via .env)
+HTTP_POOL_SIZE = 20
+HTTP_MAX_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.3
+HTTP_RETRY_STATUSES = (502, 503, 504)
+HTTP_CONNECT_TIMEOUT = 3.05  # seconds
+HTTP_READ_TIMEOUT = 10.0  # seconds
+
+# Per-endpoint (connect, read) timeouts, matched by longest path prefix
+ENDPOINT_TIMEOUTS = {
+    "/health": (2.0, 3.0),
+    "/api/v1/dashboard/devices": (3.05, 5.0),
+    "/api/v1/dashboard/data": (3.05, 8.0),
+    "/api/v1/dashboard/blockchain/logs": (3.05, 15.0),
+    "/api/v1/dashboard/analytics": (3.05, 20.0),
+    "/api/v1/sensor": (3.05, 5.0),
+    "/api/v1/control": (3.05, 5.0),
+}
+
+# Endpoint capability probing: statuses meaning "route not implemented",
+# cached per backend and re-probed after the TTL
+UNSUPPORTED_STATUSES = (404, 405, 501)
+CAPABILITY_TTL = 300.0  # seconds
+
+# Route templates (used to key per-endpoint circuit breakers)
+API_ROUTES = (
+    "/health",
+    "/api/v1/dashboard/devices",
+    "/api/v1/dashboard/data",
+    "/api/v1/dashboard/blockchain/logs",
+    "/api/v1/dashboard/analytics",
+    "/api/v1/sensor/status",
+    "/api/v1/sensor/status/batch",
+    "/api/v1/sensor/history",
+    "/api/v1/sensor/history/batch",
+    "/api/v1/control/status",
+    "/api/v1/control/status/batch",
+    "/api/v1/control/override",
+)
+
+# Circuit breaker and latency budget
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before opening
+BREAKER_RESET_TIMEOUT = 15.0  # seconds open before a half-open trial call
+PAGE_LATENCY_BUDGET = 8.0  # seconds shared by all backend calls of one page run / poll
+LAST_KNOWN_MAX_ENTRIES = 512  # last good GET responses kept for open-breaker fallback
+
+# Instrumentation: latency histogram bucket bounds (seconds) and the metrics
+# file rewrite period (METRICS_PORT / METRICS_FILE env vars enable export)
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_FILE_INTERVAL = 15.0  # seconds
+
+# Multi-device batch fetch
+BATCH_MAX_DEVICES = 100  # device IDs per batch request
+BATCH_FALLBACK_CONCURRENCY = 16  # parallel single-device calls without a batch endpoint
+
+# Fleet overview: tiles refreshed in batches of stalest devices
+FLEET_REFRESH_INTERVAL = 30.0  # seconds before a device's tile is refetched
+FLEET_REFRESH_BATCH = 100  # devices per get_many_sensor_history call
+FLEET_MAX_CONCURRENCY = 32  # single-device requests in flight without a batch endpoint
+FLEET_SPARKLINE_POINTS = 30  # readings per device sparkline
+FLEET_FIRST_WAIT = 1.0  # seconds the first visit waits for the first batch
+FLEET_FRAGMENT_INTERVAL = 2.0  # seconds between tile grid re-renders
+
+# Concurrent fan-out for aggregated dashboard data
+FAN_OUT_WORKERS = 16
+AGGREGATION_DEADLINE = 6.0  # seconds, total for all fallback sub-requests
+
+# Async client: max requests in flight at once
+ASYNC_MAX_CONCURRENCY = 100
+
+# Shared dashboard poller
+DEFAULT_REFRESH_INTERVAL = 5.0  # seconds
+VIEWER_LEASE_INTERVALS = 3  # a viewer lease lapses after this many missed refreshes
+DEVICE_LIST_TTL = 30.0  # seconds
+HISTORY_CHART_LIMIT = 1000  # readings handed to the trend chart (downsampled to its pixel width)
+
+# Live event stream (server-sent events)
+STREAM_ENDPOINT = "/api/v1/stream/events"
+STREAM_READ_TIMEOUT = 60.0  # seconds without bytes (incl. heartbeats) before reconnecting
+STREAM_RECONNECT_MIN = 1.0  # seconds
+STREAM_RECONNECT_MAX = 30.0  # seconds
+STREAM_RECONCILE_INTERVAL = 60.0  # seconds between sensor history re-syncs while the stream is live
+
+# Dashboard fragment schedules (fragments read shared snapshots, never the backend)
+LIVE_FRAGMENT_INTERVAL = 1.0  # seconds - sensor row, gauge, control/fault cards
+AI_FRAGMENT_INTERVALS = 3  # AI cards refresh every N refresh intervals
+
+# Charts: switch history traces to WebGL (Scattergl) above this many points per trace
+WEBGL_POINT_THRESHOLD = 1000
+
+# Chart downsampling: points sent per horizontal pixel, and the min/max
+# preselection size (x target points) applied before LTTB on long windows
+DOWNSAMPLE_POINTS_PER_PX = 1.0
+DOWNSAMPLE_MINMAX_RATIO = 4
+HISTORY_CHART_WIDTH_PX = 600  # trend chart sits in a half-width column
+
+# Sensor channels stored per reading (columnar store field order)
+SENSOR_FIELDS = ("pm25", "co2", "co", "voc")
+
+# Rolling analytics: windows (name -> seconds), time buckets per window and
+# histogram bins per sensor range (percentiles are accurate to one bin)
+ROLLING_WINDOWS = {"5m": 300, "1h": 3600, "24h": 86400}
+ROLLING_BUCKETS = 60
+ROLLING_HISTOGRAM_BINS = 100
+SENSOR_RANGES = {
+    "pm25": (0.0, 500.0),  # µg/m³
+    "co2": (0.0, 5000.0),  # ppm
+    "co": (0.0, 50.0),  # ppm
+    "voc": (0.0, 2000.0),  # ppb
+}
+ROLLING_DELTA_WINDOW = "1h"  # metric cards show the change against this window's mean
+
+# Per-device sensor history ring buffer
+HISTORY_BUFFER_CAPACITY = 1000  # readings kept in memory per device
+HISTORY_BACKFILL_LIMIT = 50  # readings fetched on the first sync
+HISTORY_SYNC_LIMIT = 50  # max readings fetched per incremental sync
+
+# Local sensor time-series store (TIMESERIES_PATH env var, empty disables)
+TIMESERIES_PATH = ".cache/timeseries"
+TIMESERIES_RAW_DAYS = 7  # days kept at full resolution
+TIMESERIES_RETENTION_DAYS = 90  # days kept at all
+TIMESERIES_COMPACT_BUCKET = 60  # seconds per averaged point in compacted days
+TIMESERIES_COMPACT_INTERVAL = 3600.0  # seconds between retention passes
+
+# Dashboard trend chart windows (label -> hours from the archive, None = live buffer)
+HISTORY_WINDOWS = {
+    "Live": None,
+    "1 hour": 1,
+    "24 hours": 24,
+    "7 days": 24 * 7,
+}
+
+# EPA AQI breakpoints (Technical Assistance Document, 2024 PM2.5 revision)
+# pollutant -> (unit, decimals concentrations are truncated to,
+#               [(C_lo, C_hi, I_lo, I_hi), ...])
+AQI_BREAKPOINTS = {
+    "pm25": ("µg/m³", 1, [  # 24-hour
+        (0.0, 9.0, 0, 50), (9.1, 35.4, 51, 100), (35.5, 55.4, 101, 150),
+        (55.5, 125.4, 151, 200), (125.5, 225.4, 201, 300), (225.5, 325.4, 301, 500),
+    ]),
+    "pm10": ("µg/m³", 0, [  # 24-hour
+        (0, 54, 0, 50), (55, 154, 51, 100), (155, 254, 101, 150),
+        (255, 354, 151, 200), (355, 424, 201, 300), (425, 604, 301, 500),
+    ]),
+    "co": ("ppm", 1, [  # 8-hour
+        (0.0, 4.4, 0, 50), (4.5, 9.4, 51, 100), (9.5, 12.4, 101, 150),
+        (12.5, 15.4, 151, 200), (15.5, 30.4, 201, 300), (30.5, 50.4, 301, 500),
+    ]),
+    "o3": ("ppm", 3, [  # 8-hour
+        (0.000, 0.054, 0, 50), (0.055, 0.070, 51, 100), (0.071, 0.085, 101, 150),
+        (0.086, 0.105, 151, 200), (0.106, 0.200, 201, 300),
+    ]),
+    "so2": ("ppb", 0, [  # 1-hour
+        (0, 35, 0, 50), (36, 75, 51, 100), (76, 185, 101, 150),
+        (186, 304, 151, 200), (305, 604, 201, 300), (605, 1004, 301, 500),
+    ]),
+    "no2": ("ppb", 0, [  # 1-hour
+        (0, 53, 0, 50), (54, 100, 51, 100), (101, 360, 101, 150),
+        (361, 649, 151, 200), (650, 1249, 201, 300), (1250, 2049, 301, 500),
+    ]),
+}
+AQI_MAX = 500
 
 CO2_GOOD = 800
 CO2_MODERATE = 1000
@@ -24,6 +180,16 @@ COLOR_INFO = "#00D9FF"
 COLOR_BACKGROUND = "#0E1117"
 COLOR_CARD = "#1E1E1E"
 
+# AQI categories: (upper AQI bound, label, color)
+AQI_CATEGORIES = (
+    (50, "Good", COLOR_SUCCESS),
+    (100, "Moderate", COLOR_INFO),
+    (150, "Unhealthy for Sensitive", COLOR_WARNING),
+    (200, "Unhealthy", COLOR_DANGER),
+    (300, "Very Unhealthy", COLOR_DANGER),
+    (AQI_MAX, "Hazardous", COLOR_DANGER),
+)
+
 # Smoke risk levels
 RISK_LOW = "LOW"
 RISK_MEDIUM = "MEDIUM"
@@ -54,3 +220,28 @@ EVENT_TYPES = {
     "fault": "Fault Detected",
     "healing": "Self-Healing"
 }
+
+# Blockchain chain-integrity verification: an entry's `hash` is the SHA-256
+# of the canonical JSON (sorted keys, no whitespace) of these fields, and
+# `previous_hash` links it to its predecessor (genesis uses "" or all zeros)
+CHAIN_HASH_FIELDS = ("event_type", "timestamp", "device_id", "data", "previous_hash")
+CHAIN_PREVIOUS_HASH_FIELD = "previous_hash"
+CHAIN_GENESIS_HASHES = ("", "0" * 64)
+CHAIN_VERIFY_WORKERS = 8
+CHAIN_PARALLEL_THRESHOLD = 256  # new entries per batch before hashing is split across workers
+CHAIN_SYNC_PAGE_SIZE = 500  # logs per page when pulling the unfiltered chain
+
+# Local blockchain log cache (SQLite; LOG_CACHE_PATH env var, empty disables)
+LOG_CACHE_PATH = ".cache/blockchain_logs.sqlite3"
+LOG_SYNC_PAGE_SIZE = 500  # logs per page when syncing the cache
+LOG_CACHE_SYNC_WAIT = 1.0  # seconds a page waits for a background sync before rendering
+
+# Blockchain page: log entries fetched and rendered per page, and the
+# time-range filter options (label -> hours back, None = no bound)
+LOG_PAGE_SIZE = 20
+LOG_TIME_RANGES = {
+    "Any time": None,
+    "Last hour": 1,
+    "Last 24 hours": 24,
+    "Last 7 days": 24 * 7,
+}
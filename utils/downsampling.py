@@ -0,0 +1,125 @@
+"""
+Time-Series Downsampling for Charts
+Shape-preserving reduction (min/max bucketing + Largest-Triangle-Three-Buckets)
+vectorized across all sensor channels at once
+"""
+from typing import Dict, Tuple, Sequence
+
+import numpy as np
+
+from utils.constants import DOWNSAMPLE_POINTS_PER_PX, DOWNSAMPLE_MINMAX_RATIO
+
+
+def target_points(width_px: int) -> int:
+    """Number of points worth sending for a chart of the given pixel width"""
+    return max(int(width_px * DOWNSAMPLE_POINTS_PER_PX), 3)
+
+
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    """Edges splitting indices [1, n-1) into n_buckets near-equal buckets (first/last points kept apart)"""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+
+def minmax_indices(ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max bucketing: keep each bucket's extreme points, per channel
+    ys: (channels, n) -> sorted indices of shape (channels, ~n_out)
+    """
+    channels, n = ys.shape
+    if n <= n_out:
+        return np.broadcast_to(np.arange(n), (channels, n))
+
+    n_buckets = max((n_out - 2) // 2, 1)
+    bucket_size = (n - 2) // n_buckets
+    usable = bucket_size * n_buckets
+    body = ys[:, 1:1 + usable].reshape(channels, n_buckets, bucket_size)
+    offsets = 1 + np.arange(n_buckets) * bucket_size
+
+    lo = np.argmin(body, axis=2) + offsets
+    hi = np.argmax(body, axis=2) + offsets
+    first = np.zeros((channels, 1), dtype=np.int64)
+    last = np.full((channels, 1), n - 1, dtype=np.int64)
+    return np.sort(np.concatenate([first, lo, hi, last], axis=1), axis=1)
+
+
+def lttb_indices(xs: np.ndarray, ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets, per channel
+    xs, ys: (channels, n) numeric -> indices of shape (channels, n_out)
+    The bucket loop is sequential by nature; each step is vectorized over
+    every channel and every point in the bucket.
+    """
+    channels, n = ys.shape
+    if n <= n_out or n_out < 3:
+        return np.broadcast_to(np.arange(n), (channels, n))
+
+    edges = _bucket_edges(n, n_out - 2)
+    selected = np.empty((channels, n_out), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = n - 1
+    rows = np.arange(channels)
+    prev = np.zeros(channels, dtype=np.int64)
+
+    for b in range(n_out - 2):
+        start, end = edges[b], max(edges[b + 1], edges[b] + 1)
+        # Average of the next bucket (or the last point) is the third vertex
+        next_start = edges[b + 1]
+        next_end = edges[b + 2] if b + 2 < len(edges) else n
+        if next_end <= next_start:
+            next_start, next_end = n - 1, n
+        avg_x = xs[:, next_start:next_end].mean(axis=1)
+        avg_y = ys[:, next_start:next_end].mean(axis=1)
+
+        ax = xs[rows, prev][:, None]
+        ay = ys[rows, prev][:, None]
+        bx = xs[:, start:end]
+        by = ys[:, start:end]
+        area = np.abs((ax - avg_x[:, None]) * (by - ay) - (ax - bx) * (avg_y[:, None] - ay))
+        prev = start + np.argmax(area, axis=1)
+        selected[:, b + 1] = prev
+
+    return selected
+
+
+def downsample(x: np.ndarray, ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Shape-preserving indices for every channel, shape (channels, <= n_out)
+    Very long series are first reduced with min/max buckets (cheap, keeps
+    peaks), then LTTB picks the final points - cost stays flat in n.
+    """
+    channels, n = ys.shape
+    if n <= n_out:
+        return np.broadcast_to(np.arange(n), ys.shape)
+
+    # Selection ignores gaps; plotted values keep their NaNs
+    ys_sel = np.where(np.isnan(ys), 0.0, ys)
+    x_num = x.astype(np.int64).astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+
+    preselect = n_out * DOWNSAMPLE_MINMAX_RATIO
+    if n <= preselect:
+        return lttb_indices(np.broadcast_to(x_num, ys.shape), ys_sel, n_out)
+
+    # Min/max preselection per channel, then LTTB over each channel's subset
+    pre = minmax_indices(ys_sel, preselect)
+    picked = lttb_indices(x_num[pre], np.take_along_axis(ys_sel, pre, axis=1), n_out)
+    return np.take_along_axis(pre, picked, axis=1)
+
+
+def shared_indices(columns: Dict[str, np.ndarray], n_out: int) -> np.ndarray:
+    """
+    Sorted union of every channel's min/max picks for n_out points - one
+    shared x axis (at most channels x n_out points) that keeps each
+    channel's peaks, so charts can finish the reduction cheaply
+    """
+    ys = np.vstack([np.asarray(values, dtype=np.float64) for values in columns.values()])
+    if ys.shape[1] <= n_out:
+        return np.arange(ys.shape[1])
+    return np.unique(minmax_indices(np.where(np.isnan(ys), 0.0, ys), n_out))
+
+
+def downsample_columns(x: np.ndarray, columns: Dict[str, np.ndarray], n_out: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Downsample named series sharing one x axis -> {name: (x, y)}"""
+    names: Sequence[str] = list(columns)
+    ys = np.vstack([np.asarray(columns[name], dtype=np.float64) for name in names])
+    indices = downsample(x, ys, n_out)
+    return {name: (x[indices[i]], ys[i, indices[i]]) for i, name in enumerate(names)}
@@ -1,15 +1,23 @@
 """
 Data Formatting Utilities
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
+from utils.aqi import aqi_category, sub_index_scalar
+
+
+# Every displayed timestamp is UTC (naive timestamps are taken as UTC)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 def format_timestamp(timestamp: str) -> str:
-    """Format ISO timestamp to readable format"""
+    """Format ISO timestamp to readable format, in UTC"""
     try:
         dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+        return dt.strftime(TIMESTAMP_FORMAT)
     except:
         return timestamp
 
@@ -24,24 +32,7 @@ def get_aqi_category(pm25: float) -> tuple[str, str]:
     Get AQI category and color based on PM2.5 value
     Returns: (category, color)
     """
-    from utils.constants import (
-        PM25_GOOD, PM25_MODERATE, PM25_UNHEALTHY_SENSITIVE,
-        PM25_UNHEALTHY, PM25_VERY_UNHEALTHY,
-        COLOR_SUCCESS, COLOR_INFO, COLOR_WARNING, COLOR_DANGER
-    )
-    
-    if pm25 <= PM25_GOOD:
-        return "Good", COLOR_SUCCESS
-    elif pm25 <= PM25_MODERATE:
-        return "Moderate", COLOR_INFO
-    elif pm25 <= PM25_UNHEALTHY_SENSITIVE:
-        return "Unhealthy for Sensitive", COLOR_WARNING
-    elif pm25 <= PM25_UNHEALTHY:
-        return "Unhealthy", COLOR_DANGER
-    elif pm25 <= PM25_VERY_UNHEALTHY:
-        return "Very Unhealthy", COLOR_DANGER
-    else:
-        return "Hazardous", COLOR_DANGER
+    return aqi_category(sub_index_scalar("pm25", pm25))
 
 
 def get_risk_color(risk_level: str) -> str:
@@ -0,0 +1,41 @@
+"""
+Blockchain Log Frame
+Typed columnar view of fetched blockchain logs, built in one pass per fetch
+"""
+from typing import Dict, List
+
+import pandas as pd
+
+from utils.constants import EVENT_TYPES
+from utils.formatters import TIMESTAMP_FORMAT
+
+# Record fields kept as columns (missing keys become nulls)
+LOG_COLUMNS = ("event_type", "timestamp", "device_id", "hash", "data")
+
+
+def build_log_frame(logs: List[Dict]) -> pd.DataFrame:
+    """
+    Logs -> DataFrame with categorical `event_type`, UTC `timestamp`
+    (vectorized ISO parsing) and a display-ready `time_label`
+    Unknown event types get their own categories after the known ones.
+    """
+    frame = pd.DataFrame.from_records(logs, columns=LOG_COLUMNS)
+
+    event_types = frame["event_type"].fillna("unknown").astype(str)
+    extra = sorted(set(event_types.unique()) - set(EVENT_TYPES))
+    frame["event_type"] = pd.Categorical(event_types, categories=list(EVENT_TYPES) + extra)
+
+    raw_timestamps = frame["timestamp"].fillna("").astype(str)
+    frame["timestamp"] = pd.to_datetime(raw_timestamps, utc=True, errors="coerce", format="ISO8601")
+    # Labels are UTC and unparseable timestamps are shown as received, like format_timestamp
+    frame["time_label"] = frame["timestamp"].dt.strftime(TIMESTAMP_FORMAT).fillna(raw_timestamps)
+
+    frame["device_id"] = frame["device_id"].fillna("N/A").astype(str)
+    frame["hash"] = frame["hash"].fillna("N/A").astype(str)
+    frame["data"] = frame["data"].where(frame["data"].notna(), None)
+    return frame
+
+
+def event_counts(frame: pd.DataFrame) -> Dict[str, int]:
+    """Log count per event type in one grouped pass (zero for absent known types)"""
+    return frame["event_type"].value_counts(sort=False).to_dict()
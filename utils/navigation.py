@@ -65,7 +65,7 @@ def render_top_nav():
     """, unsafe_allow_html=True)
     
     # Layout for nav buttons
-    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 2])
+    col1, col2, col3, col4, col5, col6 = st.columns([2, 1, 1, 1, 1, 1])
     
     with col1:
         st.markdown(f"<h3 style='color: #F5F5DC; margin: 0; padding-left: 10px;'>VAYU AI</h3>", unsafe_allow_html=True)
@@ -81,6 +81,10 @@ def render_top_nav():
     with col4:
         if st.button("Blockchain", use_container_width=True):
             st.switch_page("pages/2_Blockchain.py")
+
+    with col5:
+        if st.button("Fleet", use_container_width=True):
+            st.switch_page("pages/3_Fleet.py")
             
     # Inline style for the beige background behind buttons if needed, 
     # but Streamlit buttons have their own styling. 
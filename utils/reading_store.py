@@ -0,0 +1,139 @@
+"""
+Columnar Sensor Reading Store
+Fixed-dtype numpy columns for timestamp, pm25, co2, co and voc, appended in place
+"""
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Iterable
+
+import numpy as np
+
+from utils.constants import SENSOR_FIELDS
+
+
+def parse_timestamp_ns(value) -> Optional[int]:
+    """ISO timestamp -> UTC epoch nanoseconds (naive timestamps are taken as UTC)"""
+    try:
+        dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) * 1_000_000_000 + dt.microsecond * 1_000
+
+
+class ReadingColumns:
+    """
+    Read-only columnar window of readings, oldest first
+    Every column is a numpy view into the store's backing arrays - no copies.
+    """
+
+    __slots__ = ("timestamp",) + SENSOR_FIELDS
+
+    def __init__(self, timestamp: np.ndarray, **columns: np.ndarray):
+        self.timestamp = timestamp  # datetime64[ns], UTC
+        for field in SENSOR_FIELDS:
+            setattr(self, field, columns[field])
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def tail(self, n: int) -> "ReadingColumns":
+        """View of the newest n readings"""
+        start = max(len(self) - n, 0)
+        return ReadingColumns(self.timestamp[start:], **{f: getattr(self, f)[start:] for f in SENSOR_FIELDS})
+
+    def take(self, indices: np.ndarray) -> "ReadingColumns":
+        """Copy of the readings at the given (sorted) indices"""
+        return ReadingColumns(self.timestamp[indices], **{f: getattr(self, f)[indices] for f in SENSOR_FIELDS})
+
+    def record(self, index: int) -> Dict:
+        """One reading as a dict (same keys as the backend's SensorReading, missing values omitted)"""
+        reading = {"timestamp": np.datetime_as_string(self.timestamp[index], unit="s") + "Z"}
+        for field in SENSOR_FIELDS:
+            value = getattr(self, field)[index]
+            if not np.isnan(value):
+                reading[field] = float(value)
+        return reading
+
+    def latest(self) -> Optional[Dict]:
+        """Most recent reading as a dict, if any"""
+        return self.record(-1) if len(self) else None
+
+    def to_records(self) -> List[Dict]:
+        """All readings as dicts (for callers that still want List[Dict])"""
+        return [self.record(i) for i in range(len(self))]
+
+
+class ReadingStore:
+    """
+    Append-only columnar store holding the newest `capacity` readings
+
+    Backing arrays hold 2x capacity; when the write position reaches the end,
+    the live window is copied into fresh arrays (amortized O(1) per append).
+    Fresh arrays - rather than an in-place shift - keep previously returned
+    ReadingColumns views stable while other threads keep appending.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._allocate(np.empty(0, dtype="datetime64[ns]"), {f: np.empty(0, dtype=np.float64) for f in SENSOR_FIELDS})
+
+    def _allocate(self, timestamp: np.ndarray, columns: Dict[str, np.ndarray]):
+        size = self.capacity * 2
+        self._timestamp = np.empty(size, dtype="datetime64[ns]")
+        self._columns = {f: np.empty(size, dtype=np.float64) for f in SENSOR_FIELDS}
+        n = len(timestamp)
+        self._timestamp[:n] = timestamp
+        for field in SENSOR_FIELDS:
+            self._columns[field][:n] = columns[field]
+        self._start, self._end = 0, n
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_timestamp_ns(self) -> Optional[int]:
+        """Newest stored timestamp in epoch ns"""
+        return int(self._timestamp[self._end - 1].astype(np.int64)) if len(self) else None
+
+    def append(self, timestamp_ns: int, reading: Dict):
+        """Append one reading (missing sensor values are stored as NaN)"""
+        if self._end == len(self._timestamp):
+            live = self.columns()
+            self._allocate(live.timestamp, {f: getattr(live, f) for f in SENSOR_FIELDS})
+        self._timestamp[self._end] = np.datetime64(timestamp_ns, "ns")
+        for field in SENSOR_FIELDS:
+            value = reading.get(field)
+            self._columns[field][self._end] = np.nan if value is None else value
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start = self._end - self.capacity
+
+    def extend(self, readings: Iterable[Dict]) -> int:
+        """Append readings newer than the newest stored one, in timestamp order"""
+        stamped = [(ts, r) for r in readings if (ts := parse_timestamp_ns(r.get("timestamp"))) is not None]
+        stamped.sort(key=lambda item: item[0])
+        last = self.last_timestamp_ns
+        appended = 0
+        for ts, reading in stamped:
+            if last is not None and ts <= last:
+                continue
+            self.append(ts, reading)
+            last = ts
+            appended += 1
+        return appended
+
+    def columns(self, limit: Optional[int] = None) -> ReadingColumns:
+        """Zero-copy columnar view of the newest `limit` readings (all when None)"""
+        start = self._start if limit is None else max(self._end - limit, self._start)
+        return ReadingColumns(
+            self._timestamp[start:self._end],
+            **{f: self._columns[f][start:self._end] for f in SENSOR_FIELDS}
+        )
+
+    @classmethod
+    def from_readings(cls, readings: List[Dict], capacity: Optional[int] = None) -> "ReadingStore":
+        """Build a store from a list of reading dicts"""
+        store = cls(capacity or max(len(readings), 1))
+        store.extend(readings)
+        return store
@@ -0,0 +1,156 @@
+"""
+Rolling Sensor Statistics
+Streaming mean, min/max, std and approximate percentiles over sliding time windows
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.reading_store import ReadingColumns
+from utils.constants import SENSOR_FIELDS, ROLLING_WINDOWS, ROLLING_BUCKETS, ROLLING_HISTOGRAM_BINS, SENSOR_RANGES
+
+PERCENTILES = (50, 95)
+
+
+class _WindowStats:
+    """
+    One sliding window as a ring of time buckets, each holding count, sum,
+    sum of squares, min, max and a fixed-bin histogram per sensor
+
+    Adding a reading touches one bucket (O(1)); a query combines the
+    buckets still inside the window, so the window edge is exact to one
+    bucket width (window / ROLLING_BUCKETS).
+    """
+
+    def __init__(self, seconds: float, buckets: int, bins: int):
+        self.width_ns = int(seconds * 1e9 / buckets)
+        self.buckets = buckets
+        channels = len(SENSOR_FIELDS)
+        self.bucket_ids = np.full(buckets, -1, dtype=np.int64)
+        self.count = np.zeros((buckets, channels), dtype=np.int64)
+        self.sum = np.zeros((buckets, channels))
+        self.sumsq = np.zeros((buckets, channels))
+        self.min = np.full((buckets, channels), np.inf)
+        self.max = np.full((buckets, channels), -np.inf)
+        self.hist = np.zeros((buckets, channels, bins), dtype=np.int32)
+
+    def add(self, bucket_id: int, values: np.ndarray, present: np.ndarray, bin_index: np.ndarray):
+        """Add readings (rows) that all fall into one bucket"""
+        slot = bucket_id % self.buckets
+        if self.bucket_ids[slot] != bucket_id:
+            if self.bucket_ids[slot] > bucket_id:
+                return  # older than anything the ring still covers
+            self.bucket_ids[slot] = bucket_id
+            self.count[slot] = 0
+            self.sum[slot] = 0.0
+            self.sumsq[slot] = 0.0
+            self.min[slot] = np.inf
+            self.max[slot] = -np.inf
+            self.hist[slot] = 0
+        v = np.where(present, values, 0.0)
+        self.count[slot] += present.sum(axis=0)
+        self.sum[slot] += v.sum(axis=0)
+        self.sumsq[slot] += (v * v).sum(axis=0)
+        self.min[slot] = np.minimum(self.min[slot], np.where(present, values, np.inf).min(axis=0))
+        self.max[slot] = np.maximum(self.max[slot], np.where(present, values, -np.inf).max(axis=0))
+        rows, channels = np.nonzero(present)
+        np.add.at(self.hist[slot], (channels, bin_index[rows, channels]), 1)
+
+    def live(self, now_ns: int) -> np.ndarray:
+        """Slots whose bucket is inside the window ending at now_ns"""
+        current = now_ns // self.width_ns
+        return (self.bucket_ids > current - self.buckets) & (self.bucket_ids <= current)
+
+
+class RollingStats:
+    """
+    Rolling statistics of one device's readings over every ROLLING_WINDOWS window
+
+    `update` costs O(1) per reading regardless of window length. Percentiles
+    are read from per-sensor histograms over SENSOR_RANGES, so they are
+    accurate to one histogram bin. Windows end at the newest reading seen,
+    so a device that went quiet still shows its last statistics.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None, buckets: int = ROLLING_BUCKETS,
+                 bins: int = ROLLING_HISTOGRAM_BINS):
+        self.windows = dict(windows or ROLLING_WINDOWS)
+        self.bins = bins
+        self._lo = np.array([SENSOR_RANGES[f][0] for f in SENSOR_FIELDS], dtype=np.float64)
+        self._hi = np.array([SENSOR_RANGES[f][1] for f in SENSOR_FIELDS], dtype=np.float64)
+        self._bin_width = (self._hi - self._lo) / bins
+        self._stats = {name: _WindowStats(seconds, buckets, bins) for name, seconds in self.windows.items()}
+        self.last_timestamp_ns: Optional[int] = None
+
+    def update(self, timestamp_ns: int, values: np.ndarray):
+        """Add one reading (values in SENSOR_FIELDS order, NaN = missing)"""
+        self.update_many(np.array([timestamp_ns], dtype=np.int64), np.asarray(values, dtype=np.float64)[None, :])
+
+    def update_many(self, timestamps_ns: np.ndarray, values: np.ndarray):
+        """
+        Add readings in time order: values is (n, sensors); each run of
+        readings sharing a bucket is folded in with one set of array ops
+        """
+        if not len(timestamps_ns):
+            return
+        present = ~np.isnan(values)
+        bin_index = np.clip(((np.nan_to_num(values) - self._lo) / self._bin_width).astype(np.int64), 0, self.bins - 1)
+        for window in self._stats.values():
+            buckets = timestamps_ns // window.width_ns
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1, [len(buckets)]])
+            for lo, hi in zip(starts[:-1], starts[1:]):
+                window.add(int(buckets[lo]), values[lo:hi], present[lo:hi], bin_index[lo:hi])
+        newest = int(timestamps_ns.max())
+        if self.last_timestamp_ns is None or newest > self.last_timestamp_ns:
+            self.last_timestamp_ns = newest
+
+    def update_columns(self, readings: ReadingColumns):
+        """Add every reading of a columnar window, oldest first"""
+        if not len(readings):
+            return
+        self.update_many(
+            readings.timestamp.astype("datetime64[ns]").astype(np.int64),
+            np.column_stack([getattr(readings, f) for f in SENSOR_FIELDS]).astype(np.float64)
+        )
+
+    def summary(self, window: str) -> Dict[str, Dict[str, Optional[float]]]:
+        """{sensor: {count, mean, std, min, max, p50, p95}} for one window"""
+        stats = self._stats[window]
+        empty = {"count": 0, "mean": None, "std": None, "min": None, "max": None,
+                 **{f"p{p}": None for p in PERCENTILES}}
+        if self.last_timestamp_ns is None:
+            return {field: dict(empty) for field in SENSOR_FIELDS}
+
+        live = stats.live(self.last_timestamp_ns)
+        count = stats.count[live].sum(axis=0)
+        total = stats.sum[live].sum(axis=0)
+        total_sq = stats.sumsq[live].sum(axis=0)
+        lo = stats.min[live].min(axis=0, initial=np.inf)
+        hi = stats.max[live].max(axis=0, initial=-np.inf)
+        hist = stats.hist[live].sum(axis=0)
+        cumulative = hist.cumsum(axis=1)
+
+        result = {}
+        for i, field in enumerate(SENSOR_FIELDS):
+            n = int(count[i])
+            if not n:
+                result[field] = dict(empty)
+                continue
+            mean = total[i] / n
+            variance = max(total_sq[i] / n - mean * mean, 0.0)
+            entry = {"count": n, "mean": float(mean), "std": float(np.sqrt(variance)),
+                     "min": float(lo[i]), "max": float(hi[i])}
+            for p in PERCENTILES:
+                # Interpolated inside the bin holding the p-th percentile, clamped to the observed range
+                target = n * p / 100.0
+                b = min(int(np.searchsorted(cumulative[i], target)), self.bins - 1)
+                below = cumulative[i][b - 1] if b else 0
+                fraction = (target - below) / hist[i][b] if hist[i][b] else 0.5
+                value = self._lo[i] + (b + fraction) * self._bin_width[i]
+                entry[f"p{p}"] = float(min(max(value, lo[i]), hi[i]))
+            result[field] = entry
+        return result
+
+    def summaries(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """summary() of every window, keyed by window name"""
+        return {window: self.summary(window) for window in self.windows}